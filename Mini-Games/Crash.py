@@ -1,15 +1,49 @@
-import random
+import argparse
 import time
 
-def crash_game():
+from crash_engine import draw_crash_point, has_crashed, next_multiplier
+from crash_ticker import JitterStats, LineReader, Ticker
+
+def realtime_round(reader, crash_point, tick_rate, stats):
+    # Returns the multiplier cashed out at, or None if the round crashed first.
+    multiplier = 1.0
+    print("Game started! (Crash point is hidden) Press Enter to cash out.")
+    reader.discard_pending()
+    ticker = Ticker(tick_rate, stats)
+    pending = None
+    while True:
+        if pending is None:
+            pending = reader.wait(ticker.next_deadline)
+        if pending is not None:
+            arrived, line = pending
+            if line is None:
+                raise EOFError
+            if arrived < ticker.next_deadline:
+                if ticker.count:
+                    return multiplier
+                # Nothing has been shown yet: cashing out now would just refund the bet.
+                pending = None
+                continue
+        ticker.fire()
+        if has_crashed(multiplier, crash_point):
+            return None
+        multiplier = next_multiplier(multiplier)
+        print(f"\rMultiplier: x{multiplier}   ", end="", flush=True)
+
+def crash_game(realtime=False, tick_rate=2.0):
     print("Welcome to Crash!")
     balance = 100.0
     high_score = balance
+    if realtime:
+        reader = LineReader()
+        ask = reader.input
+    else:
+        ask = input
 
     while True:
         print(f"\nYour balance: ${balance:.2f} | High Score: ${high_score:.2f}")
         try:
-            bet = float(input("Enter your bet (0 to quit): "))
+            bet = float(ask("Enter your bet (0 to quit): "))
         except ValueError:
             print("Invalid input.")
             continue
@@ -22,12 +56,27 @@ def crash_game():
 
         multiplier = 1.0
         crashed = False
-        crash_point = round(random.uniform(1.1, 10.0), 2)
-        print(f"Game started! (Crash point is hidden)")
+        crash_point = draw_crash_point()
+        if realtime:
+            stats = JitterStats()
+            cashed_at = realtime_round(reader, crash_point, tick_rate, stats)
+            if cashed_at is not None:
+                winnings = round(bet * cashed_at, 2)
+                balance += winnings - bet
+                print(f"\nYou cashed out at x{cashed_at}! You won ${winnings:.2f}")
+                if balance > high_score:
+                    high_score = balance
+                    print("🎉 New High Score! 🎉")
+            else:
+                print(f"\nCrashed at x{crash_point}! You lost your bet.")
+                balance -= bet
+            print(f"Tick jitter this round: {stats.summary()}")
+        else:
+            print(f"Game started! (Crash point is hidden)")
 
-        while True:
+        while not realtime:
             time.sleep(0.5)
-            multiplier = round(multiplier + random.uniform(0.05, 0.25), 2)
+            multiplier = next_multiplier(multiplier)
             print(f"Multiplier: x{multiplier}", end='\r')
             action = input("Press 'c' to cash out, Enter to continue: ").strip().lower()
             if action == 'c':
@@ -38,7 +87,7 @@ def crash_game():
                     high_score = balance
                     print("🎉 New High Score! 🎉")
                 break
-            if multiplier >= crash_point:
+            if has_crashed(multiplier, crash_point):
                 print(f"\nCrashed at x{crash_point}! You lost your bet.")
                 balance -= bet
                 crashed = True
@@ -49,10 +98,14 @@ def crash_game():
             break
 
         # Offer to play again or quit
-        again = input("Play again? (y/n): ").strip().lower()
+        again = ask("Play again? (y/n): ").strip().lower()
         if again != 'y':
             print("Thanks for playing!")
             break
 
 if __name__ == "__main__":
-    crash_game()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Crash")
+    parser.add_argument("--realtime", action="store_true", help="advance the multiplier on a clock instead of on Enter")
+    parser.add_argument("--rate", type=float, default=2.0, help="ticks per second in real-time mode")
+    args = parser.parse_args()
+    crash_game(args.realtime, args.rate)
\ No newline at end of file
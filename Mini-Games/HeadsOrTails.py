@@ -6,6 +6,11 @@ MIN_BET = 1
 STARTING_WIN_CHANCE = 0.5  
 WIN_CHANCE_STEP = 0.02     
 
+def next_win_chance(win_chance, won):
+    if won:
+        return max(0.0, win_chance - WIN_CHANCE_STEP)
+    return min(1.0, win_chance + WIN_CHANCE_STEP)
+
 def get_bet(balance):
     while True:
         try:
@@ -40,11 +45,11 @@ def play_round(balance, win_chance):
     if user_choice == result:
         print("You win!")
         balance += bet
-        win_chance = max(0.0, win_chance - WIN_CHANCE_STEP)
+        win_chance = next_win_chance(win_chance, True)
     else:
         print("You lose!")
         balance -= bet
-        win_chance = min(1.0, win_chance + WIN_CHANCE_STEP)
+        win_chance = next_win_chance(win_chance, False)
     return balance, win_chance
 
 def heads_or_tails():
@@ -1,4 +1,12 @@
-import random
+from alias_sampler import AliasSampler
+
+STARTING_MONEY = 100.0
+STARTING_QUOTA = 100.0
+ROUNDS_PER_CYCLE = 7
+QUOTA_GROWTH = 1.5
+MULTIPLIERS = [0.2, 0.5, 1, 2, 5, 10, 100]
+WEIGHTS = [205, 205, 205, 205, 100, 30, 50]
+MULTIPLIER_SAMPLER = AliasSampler(MULTIPLIERS, WEIGHTS)
 
 def get_bet(money):
     while True:
@@ -18,23 +26,20 @@ def print_status(round_number, cycle, money, quota):
     print(f"Cycle {cycle} | Money: ${money:.2f} | Quota: ${quota:.2f}")
 
 def main():
-    money = 100.0
-    quota = 100.0
+    money = STARTING_MONEY
+    quota = STARTING_QUOTA
     round_number = 1
     cycle = 1
 
-    multipliers = [0.2, 0.5, 1, 2, 5, 10, 100]
-    weights = [205, 205, 205, 205, 100, 30, 50]
-
     print("Welcome to the Survival Gambling Game!")
-    print("Every 7 rounds, you must meet the money quota or you lose.")
-    print("Starting money: $100.00\n")
+    print(f"Every {ROUNDS_PER_CYCLE} rounds, you must meet the money quota or you lose.")
+    print(f"Starting money: ${STARTING_MONEY:.2f}\n")
 
     while True:
         print_status(round_number, cycle, money, quota)
         bet = get_bet(money)
 
-        multiplier = random.choices(multipliers, weights=weights, k=1)[0]
+        multiplier = MULTIPLIER_SAMPLER.draw()
         win_amount = bet * multiplier
         money = money - bet + win_amount
 
@@ -46,13 +51,13 @@ def main():
             print("You went bankrupt! Game over.")
             break
 
-        if round_number % 7 == 0:
+        if round_number % ROUNDS_PER_CYCLE == 0:
             print(f"\n--- End of cycle {cycle} ---")
             print(f"You need at least ${quota:.2f} to survive.")
             if money >= quota:
                 print("Congratulations! You met the quota and advance to the next cycle.")
                 cycle += 1
-                quota = round(quota * 1.5, 2)
+                quota = round(quota * QUOTA_GROWTH, 2)
                 print(f"New quota: ${quota:.2f}\n")
             else:
                 print("You failed to meet the quota. Game over.")
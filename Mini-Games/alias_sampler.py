@@ -0,0 +1,110 @@
+import math
+import random
+import time
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class AliasSampler:
+    # Walker/Vose alias table: O(n) to build, then O(1) per weighted draw.
+    def __init__(self, outcomes, weights, rng=random, seed=None):
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("outcomes and weights must be non-empty and the same length")
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative with a positive sum")
+        n = len(weights)
+        self.outcomes = list(outcomes)
+        self.weights = list(weights)
+        self.rng = rng
+        self.size = n
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+        if NUMPY_AVAILABLE:
+            self._np_rng = np.random.default_rng(seed)
+            self._np_prob = np.array(self.prob)
+            self._np_alias = np.array(self.alias)
+            self._np_outcomes = np.array(self.outcomes)
+
+    def draw(self, n=None):
+        if n is None:
+            u = self.rng.random() * self.size
+            i = int(u)
+            return self.outcomes[i] if u - i < self.prob[i] else self.outcomes[self.alias[i]]
+        if not NUMPY_AVAILABLE:
+            return [self.draw() for _ in range(n)]
+        return self._np_outcomes[self._draw_indices(n)]
+
+    def _draw_indices(self, n):
+        columns = self._np_rng.integers(self.size, size=n)
+        keep = self._np_rng.random(n) < self._np_prob[columns]
+        return np.where(keep, columns, self._np_alias[columns])
+
+    def expected(self):
+        total = float(sum(self.weights))
+        return [w / total for w in self.weights]
+
+    def self_test(self, draws=1_000_000, bulk=True):
+        # Pearson chi-square of observed counts against the weights. The critical value
+        # uses the Wilson-Hilferty approximation so no stats package is needed.
+        if bulk and NUMPY_AVAILABLE:
+            counts = np.bincount(self._draw_indices(draws), minlength=self.size).tolist()
+        else:
+            index = {outcome: i for i, outcome in enumerate(self.outcomes)}
+            counts = [0] * self.size
+            for _ in range(draws):
+                counts[index[self.draw()]] += 1
+        cells = [(c, p * draws) for c, p in zip(counts, self.expected()) if p > 0]
+        chi2 = sum((c - e) ** 2 / e for c, e in cells)
+        dof = max(len(cells) - 1, 1)
+        z = 3.090  # one-sided 0.1% level
+        critical = dof * (1 - 2 / (9 * dof) + z * math.sqrt(2 / (9 * dof))) ** 3
+        return {"chi2": chi2, "dof": dof, "critical": critical, "passed": chi2 < critical, "counts": counts}
+
+
+def main():
+    from QuotaGamble import MULTIPLIERS, WEIGHTS
+
+    sampler = AliasSampler(MULTIPLIERS, WEIGHTS)
+    for bulk in (False, True):
+        result = sampler.self_test(draws=1_000_000 if bulk else 200_000, bulk=bulk)
+        print(f"{'Bulk' if bulk else 'Scalar'} self-test: chi2 {result['chi2']:.2f} "
+              f"(dof {result['dof']}, critical {result['critical']:.2f}) -> "
+              f"{'PASS' if result['passed'] else 'FAIL'}")
+
+    n = 200_000
+    start = time.perf_counter()
+    for _ in range(n):
+        random.choices(MULTIPLIERS, weights=WEIGHTS, k=1)[0]
+    choices = n / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(n):
+        sampler.draw()
+    scalar = n / (time.perf_counter() - start)
+    print(f"random.choices: {choices:,.0f} draws/sec | alias draw(): {scalar:,.0f} draws/sec")
+    if NUMPY_AVAILABLE:
+        n = 10_000_000
+        start = time.perf_counter()
+        sampler.draw(n)
+        print(f"alias draw({n}): {n / (time.perf_counter() - start):,.0f} draws/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,71 @@
 import random
+from array import array
 
-def create_deck():
-    deck = []
-    for suit in ['Hearts', 'Diamonds', 'Clubs', 'Spades']:
-        for rank in range(2, 11):
-            deck.append(f'{rank} of {suit}')
-        for face in ['Jack', 'Queen', 'King', 'Ace']:
-            deck.append(f'{face} of {suit}')
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+RANKS = [str(rank) for rank in range(2, 11)] + ['Jack', 'Queen', 'King', 'Ace']
+RANK_VALUES = list(range(2, 11)) + [10, 10, 10, 11]
+
+# Cards are small ints: card = suit * 13 + rank, so a shoe is just bytes.
+CARD_NAMES = [f'{rank} of {suit}' for suit in SUITS for rank in RANKS]
+CARD_VALUES = bytes(RANK_VALUES * len(SUITS))
+DECK_SIZE = len(CARD_NAMES)
+CARD_CODES = {name: card for card, name in enumerate(CARD_NAMES)}
+
+def create_deck(decks=1):
+    deck = array('B', range(DECK_SIZE)) * decks
     random.shuffle(deck)
     return deck
 
+class Hand:
+    __slots__ = ('cards', 'total', 'soft_aces')
+
+    def __init__(self, cards=()):
+        self.cards = array('B')
+        self.total = 0
+        self.soft_aces = 0
+        for card in cards:
+            self.add(card)
+
+    def add(self, card):
+        self.cards.append(card)
+        value = CARD_VALUES[card]
+        self.total += value
+        if value == 11:
+            self.soft_aces += 1
+        while self.total > 21 and self.soft_aces:
+            self.total -= 10
+            self.soft_aces -= 1
+
+    @property
+    def value(self):
+        return self.total
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __len__(self):
+        return len(self.cards)
+
+def card_code(card):
+    # Also accepts the card names ('Ace of Spades') the string-based API used.
+    return CARD_CODES[card] if isinstance(card, str) else card
+
 def calculate_hand_value(hand):
-    value = 0
-    aces = 0
-    for card in hand:
-        rank = card.split(' ')[0]
-        if rank in ['Jack', 'Queen', 'King']:
-            value += 10
-        elif rank == 'Ace':
-            aces += 1
-            value += 11
-        else:
-            value += int(rank)
-    while value > 21 and aces:
-        value -= 10
-        aces -= 1
-    return value
+    if isinstance(hand, Hand):
+        return hand.total
+    return Hand(card_code(card) for card in hand).total
 
 def display_hand(hand, name):
-    print(f"{name}'s hand: {', '.join(hand)}")
+    print(f"{name}'s hand: {', '.join(CARD_NAMES[card_code(card)] for card in hand)}")
 
 def blackjack():
     deck = create_deck()
-    player_hand = [deck.pop(), deck.pop()]
-    dealer_hand = [deck.pop(), deck.pop()]
+    player_hand = Hand((deck.pop(), deck.pop()))
+    dealer_hand = Hand((deck.pop(), deck.pop()))
 
     while True:
         display_hand(player_hand, 'Player')
-        player_value = calculate_hand_value(player_hand)
+        player_value = player_hand.value
         print(f"Player's hand value: {player_value}")
 
         if player_value > 21:
@@ -46,15 +74,15 @@ def blackjack():
 
         action = input("Do you want to [h]it or [s]tand? ").lower()
         if action == 'h':
-            player_hand.append(deck.pop())
+            player_hand.add(deck.pop())
         elif action == 's':
             break
 
-    while calculate_hand_value(dealer_hand) < 17:
-        dealer_hand.append(deck.pop())
+    while dealer_hand.value < 17:
+        dealer_hand.add(deck.pop())
 
     display_hand(dealer_hand, 'Dealer')
-    dealer_value = calculate_hand_value(dealer_hand)
+    dealer_value = dealer_hand.value
     print(f"Dealer's hand value: {dealer_value}")
 
     if dealer_value > 21 or player_value > dealer_value:
@@ -0,0 +1,169 @@
+import argparse
+import time
+from functools import lru_cache
+
+from blackjack import CARD_VALUES, RANK_VALUES
+
+# A shoe is keyed by how many cards of each value remain: index = value - 2,
+# so index 8 holds the ten-valued cards and index 9 the Aces.
+VALUES = range(2, 12)
+BUST = 22
+DEALER_STANDS_ON = 17
+DEALER_FINALS = (17, 18, 19, 20, 21, "bust")
+# Entries per memo table (about 0.5 KB each). A shoe composition is rarely seen again
+# once cards are dealt, so an unbounded cache would grow for the whole run.
+CACHE_SIZE = 1 << 16
+
+
+def full_shoe(decks=1):
+    counts = [0] * len(VALUES)
+    for value in RANK_VALUES:
+        counts[value - 2] += 4 * decks
+    return tuple(counts)
+
+
+def shoe_counts(cards):
+    counts = [0] * len(VALUES)
+    for card in cards:
+        counts[CARD_VALUES[card] - 2] += 1
+    return tuple(counts)
+
+
+def remove_cards(counts, cards):
+    counts = list(counts)
+    for card in cards:
+        index = CARD_VALUES[card] - 2
+        if not counts[index]:
+            raise ValueError(f"No {CARD_VALUES[card]}-valued card left in the shoe")
+        counts[index] -= 1
+    return tuple(counts)
+
+
+def _add(total, soft, value):
+    total += value
+    if value == 11:
+        soft += 1
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return total, soft
+
+
+def _take(counts, index):
+    return counts[:index] + (counts[index] - 1,) + counts[index + 1:]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _dealer(total, soft, counts):
+    # Probability of every final dealer total (index 22 is bust) from this state.
+    final = [0.0] * (BUST + 1)
+    if total > 21:
+        final[BUST] = 1.0
+        return tuple(final)
+    remaining = sum(counts)
+    if total >= DEALER_STANDS_ON or not remaining:
+        final[total] = 1.0
+        return tuple(final)
+    for index, count in enumerate(counts):
+        if not count:
+            continue
+        p = count / remaining
+        next_total, next_soft = _add(total, soft, index + 2)
+        for outcome, q in enumerate(_dealer(next_total, next_soft, _take(counts, index))):
+            if q:
+                final[outcome] += p * q
+    return tuple(final)
+
+
+def dealer_distribution(up_value, counts):
+    # counts is the unseen shoe after the up-card was dealt; the hole card comes from it.
+    final = _dealer(*_add(0, 0, up_value), counts)
+    result = {total: final[total] for total in DEALER_FINALS[:-1]}
+    result["bust"] = final[BUST]
+    stiff = sum(final[:DEALER_STANDS_ON])
+    if stiff:
+        result["stiff"] = stiff
+    return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _stand_ev(player_total, up_value, counts):
+    final = _dealer(*_add(0, 0, up_value), counts)
+    win = final[BUST] + sum(final[:player_total])
+    lose = sum(final[player_total + 1:BUST])
+    return win - lose
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _best_ev(player_total, soft, up_value, counts):
+    if player_total > 21:
+        return -1.0, -1.0
+    stand = _stand_ev(player_total, up_value, counts)
+    remaining = sum(counts)
+    if not remaining:
+        return stand, -1.0
+    hit = 0.0
+    for index, count in enumerate(counts):
+        if not count:
+            continue
+        next_total, next_soft = _add(player_total, soft, index + 2)
+        hit += count / remaining * max(_best_ev(next_total, next_soft, up_value, _take(counts, index)))
+    return stand, hit
+
+
+def player_ev(player_cards, up_card, counts):
+    # Stand and hit EV (hit assumes optimal play afterwards) for the exact unseen shoe.
+    total, soft = 0, 0
+    for card in player_cards:
+        total, soft = _add(total, soft, CARD_VALUES[card])
+    stand, hit = _best_ev(total, soft, CARD_VALUES[up_card], counts)
+    return {"stand": stand, "hit": hit}
+
+
+def best_action(player_cards, up_card, counts):
+    ev = player_ev(player_cards, up_card, counts)
+    return "h" if ev["hit"] > ev["stand"] else "s"
+
+
+def cache_info():
+    return {"dealer": _dealer.cache_info(), "stand": _stand_ev.cache_info(), "best": _best_ev.cache_info()}
+
+
+def clear_cache():
+    _dealer.cache_clear()
+    _stand_ev.cache_clear()
+    _best_ev.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact dealer outcome probabilities for a finite shoe")
+    parser.add_argument("--decks", type=int, default=6)
+    args = parser.parse_args()
+
+    shoe = full_shoe(args.decks)
+    print(f"Dealer final totals, fresh {args.decks}-deck shoe:")
+    print("Up   " + "  ".join(f"{str(final):>6}" for final in DEALER_FINALS))
+    up_cards = [RANK_VALUES.index(value) for value in VALUES]
+    start = time.perf_counter()
+    for up_card in up_cards:
+        up_value = CARD_VALUES[up_card]
+        dist = dealer_distribution(up_value, remove_cards(shoe, [up_card]))
+        print(f"{up_value:>2}   " + "  ".join(f"{dist[final]:6.4f}" for final in DEALER_FINALS))
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for up_card in up_cards:
+        dealer_distribution(CARD_VALUES[up_card], remove_cards(shoe, [up_card]))
+    warm = time.perf_counter() - start
+    print(f"\nFirst pass: {cold * 1000:.1f} ms, memoized pass: {warm * 1e6 / len(up_cards):.1f} us per query")
+
+    ten, six, nine = 8, 4, 7  # 10 of Hearts, 6 of Hearts, 9 of Hearts
+    counts = remove_cards(shoe, [ten, six, nine])
+    start = time.perf_counter()
+    ev = player_ev([ten, six], nine, counts)
+    print(f"Player 16 vs 9: stand {ev['stand']:+.4f}, hit {ev['hit']:+.4f} "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
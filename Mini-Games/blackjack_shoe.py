@@ -0,0 +1,157 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from blackjack import CARD_VALUES, DECK_SIZE, Hand, create_deck
+from blackjack_sim import STRATEGIES, basic_strategy
+
+DEALER_STANDS_ON = 17
+MAX_TRUE_COUNT = 10
+SHOES_PER_TASK = 200
+HAND_RESERVE = 24  # never start a hand that could run the shoe dry
+
+# Hi-Lo tags per card id: 2-6 count +1, 7-9 count 0, tens and Aces count -1.
+HI_LO = [1 if value <= 6 else -1 if value >= 10 else 0 for value in CARD_VALUES]
+
+
+def _strategy_table(strategy):
+    # Expand a vectorized blackjack_sim strategy into a [soft][value][up] lookup.
+    value, soft, up = np.meshgrid(np.arange(32), np.arange(2), np.arange(12), indexing="ij")
+    hit = np.asarray(strategy(value, soft.astype(bool), up), dtype=bool)
+    return [[[bool(hit[v, s, u]) for u in range(12)] for v in range(32)] for s in range(2)]
+
+
+def spread_bet(true_count, min_bet=1, max_bet=8):
+    return min(max(true_count, min_bet), max_bet)
+
+
+def play_shoe(decks, penetration, table, bet_for, histogram):
+    shoe = create_deck(decks)
+    cut = max(len(shoe) - int(len(shoe) * penetration), HAND_RESERVE)
+    running = 0
+    while len(shoe) > cut:
+        # Floored (+2.9 -> +2, -0.5 -> -1), the usual Hi-Lo convention; round() would
+        # round halves to even and bias the count at +/-x.5.
+        true_count = running * DECK_SIZE // len(shoe)
+        true_count = max(-MAX_TRUE_COUNT, min(MAX_TRUE_COUNT, true_count))
+        bet = bet_for(true_count)
+
+        player = Hand((shoe.pop(), shoe.pop()))
+        dealer = Hand((shoe.pop(), shoe.pop()))
+        up = CARD_VALUES[dealer.cards[0]]
+        while player.total <= 21 and table[player.soft_aces > 0][player.total][up]:
+            player.add(shoe.pop())
+        if player.total > 21:
+            result = -1
+        else:
+            while dealer.total < DEALER_STANDS_ON:
+                dealer.add(shoe.pop())
+            if dealer.total > 21 or player.total > dealer.total:
+                result = 1
+            elif player.total < dealer.total:
+                result = -1
+            else:
+                result = 0
+
+        for card in player.cards:
+            running += HI_LO[card]
+        for card in dealer.cards:
+            running += HI_LO[card]
+
+        row = histogram[true_count + MAX_TRUE_COUNT]
+        row[0] += 1
+        row[1] += bet
+        row[2] += result * bet
+        row[3] += result * result
+        row[4] += result
+
+
+def run_shoes(shoes, decks, penetration, seed, bet_for, table):
+    random.seed(seed)
+    histogram = new_histogram()
+    for _ in range(shoes):
+        play_shoe(decks, penetration, table, bet_for, histogram)
+    return histogram
+
+
+def new_histogram():
+    # Per true count: hands, units bet, units won, sum of squared flat results, flat result.
+    return [[0] * 5 for _ in range(2 * MAX_TRUE_COUNT + 1)]
+
+
+def merge(total, histogram):
+    for row, other in zip(total, histogram):
+        for i, value in enumerate(other):
+            row[i] += value
+    return total
+
+
+def simulate(shoes, decks=6, penetration=0.75, workers=None, seed=None, min_bet=1, max_bet=8, bet_for=None,
+             strategy=basic_strategy):
+    # bet_for(true_count) -> units; it runs in worker processes, so it must pickle
+    # (a module-level function or a functools.partial of one). The strategy is expanded
+    # into a lookup table here, so closures like blackjack_sim.stand_at() work too.
+    table = _strategy_table(strategy)
+    if bet_for is None:
+        bet_for = partial(spread_bet, min_bet=min_bet, max_bet=max_bet)
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    tasks = []
+    remaining = shoes
+    while remaining > 0:
+        tasks.append(min(SHOES_PER_TASK, remaining))
+        remaining -= tasks[-1]
+    histogram = new_histogram()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_shoes, n, decks, penetration, seed ^ (i << 32), bet_for, table)
+                   for i, n in enumerate(tasks)]
+        for future in futures:
+            merge(histogram, future.result())
+    return histogram
+
+
+def report(histogram):
+    hands = sum(row[0] for row in histogram)
+    bet = sum(row[1] for row in histogram)
+    won = sum(row[2] for row in histogram)
+    print(f"{'TC':>4} {'Hands':>12} {'Share':>7} {'Flat EV':>9} {'+/-95%':>8}")
+    for i, row in enumerate(histogram):
+        n = row[0]
+        if not n:
+            continue
+        ev = row[4] / n
+        half = 1.96 * math.sqrt(max(row[3] / n - ev ** 2, 0) / n)
+        print(f"{i - MAX_TRUE_COUNT:>+4} {n:>12} {n / hands:>7.2%} {ev:>+9.4f} {half:>8.4f}")
+    print(f"\nHands: {hands} | Units bet: {bet} | Units won: {won:+} | "
+          f"Return per unit bet: {won / bet:+.4%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-deck blackjack shoe simulator with Hi-Lo counting")
+    parser.add_argument("--shoes", type=int, default=10_000)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--min-bet", type=int, default=1)
+    parser.add_argument("--max-bet", type=int, default=8)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="basic")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    histogram = simulate(args.shoes, args.decks, args.penetration, args.workers, args.seed,
+                         args.min_bet, args.max_bet, strategy=STRATEGIES[args.strategy])
+    elapsed = time.perf_counter() - start
+    report(histogram)
+    hands = sum(row[0] for row in histogram)
+    print(f"{hands / elapsed:,.0f} hands/sec on {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+import blackjack
+from blackjack import Hand, CARD_NAMES, DECK_SIZE
+
+CARD_VALUES = np.frombuffer(blackjack.CARD_VALUES, dtype=np.uint8).astype(np.int16)
+DEALER_STANDS_ON = 17
+BATCH_SIZE = 100_000
+
+
+def stand_at(threshold):
+    def strategy(value, soft, dealer_up):
+        return value < threshold
+    return strategy
+
+
+def basic_strategy(value, soft, dealer_up):
+    # Hit/stand only: the game has no doubles, splits or surrender.
+    weak_dealer = (dealer_up >= 2) & (dealer_up <= 6)
+    hard_hit = (value <= 11) | ((value == 12) & ~((dealer_up >= 4) & (dealer_up <= 6))) | \
+        ((value <= 16) & ~weak_dealer)
+    soft_hit = (value <= 17) | ((value == 18) & (dealer_up >= 9))
+    return np.where(soft, soft_hit, hard_hit)
+
+
+STRATEGIES = {
+    "basic": basic_strategy,
+    "mimic": stand_at(DEALER_STANDS_ON),
+    "never-bust": stand_at(12),
+}
+
+
+def hand_values(total, aces):
+    # Same as blackjack.Hand: drop an Ace from 11 to 1 while over 21.
+    drop = np.minimum(aces, np.maximum(total - 12, 0) // 10)
+    value = total - 10 * drop
+    return value, aces > drop
+
+
+def _shuffled_decks(rng, n):
+    return rng.random((n, DECK_SIZE)).argsort(axis=1)
+
+
+def _draw(decks, pos, rows):
+    cards = decks[rows, pos[rows]]
+    pos[rows] += 1
+    return cards
+
+
+def play_batch(n, strategy, rng):
+    rows = np.arange(n)
+    decks = _shuffled_decks(rng, n)
+    pos = np.zeros(n, dtype=np.int64)
+
+    player_cards = [_draw(decks, pos, rows), _draw(decks, pos, rows)]
+    dealer_cards = [_draw(decks, pos, rows), _draw(decks, pos, rows)]
+    player_total = CARD_VALUES[player_cards[0]] + CARD_VALUES[player_cards[1]]
+    player_aces = (CARD_VALUES[player_cards[0]] == 11).astype(np.int16) + (CARD_VALUES[player_cards[1]] == 11)
+    dealer_up = CARD_VALUES[dealer_cards[0]]
+    dealer_total = dealer_up + CARD_VALUES[dealer_cards[1]]
+    dealer_aces = (dealer_up == 11).astype(np.int16) + (CARD_VALUES[dealer_cards[1]] == 11)
+
+    active = rows
+    while active.size:
+        value, soft = hand_values(player_total[active], player_aces[active])
+        hitting = active[(value <= 21) & strategy(value, soft, dealer_up[active])]
+        if not hitting.size:
+            break
+        card = CARD_VALUES[_draw(decks, pos, hitting)]
+        player_total[hitting] += card
+        player_aces[hitting] += card == 11
+        active = hitting
+
+    player_value, _ = hand_values(player_total, player_aces)
+    player_bust = player_value > 21
+
+    active = rows[~player_bust]
+    while active.size:
+        value, _ = hand_values(dealer_total[active], dealer_aces[active])
+        active = active[value < DEALER_STANDS_ON]
+        if not active.size:
+            break
+        card = CARD_VALUES[_draw(decks, pos, active)]
+        dealer_total[active] += card
+        dealer_aces[active] += card == 11
+
+    dealer_value, _ = hand_values(dealer_total, dealer_aces)
+    outcome = np.where(player_value > dealer_value, 1, np.where(player_value < dealer_value, -1, 0))
+    outcome[dealer_value > 21] = 1
+    outcome[player_bust] = -1
+    return outcome.astype(np.int8), decks, pos
+
+
+def simulate(hands, strategy=basic_strategy, seed=None, batch_size=BATCH_SIZE):
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(3, dtype=np.int64)
+    remaining = hands
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        outcome, _, _ = play_batch(n, strategy, rng)
+        counts += np.bincount(outcome + 1, minlength=3)
+        remaining -= n
+    return summarize(*counts[::-1])
+
+
+def summarize(wins, pushes, losses, z=1.96):
+    n = wins + pushes + losses
+    result = {"hands": int(n)}
+    for name, count in (("win", wins), ("push", pushes), ("loss", losses)):
+        p = count / n
+        half = z * math.sqrt(p * (1 - p) / n)
+        result[name] = (p, p - half, p + half)
+    ev = (wins - losses) / n
+    variance = (wins + losses) / n - ev ** 2
+    half = z * math.sqrt(variance / n)
+    result["ev"] = (ev, ev - half, ev + half)
+    return result
+
+
+def verify(hands=2000, strategy=basic_strategy, seed=None):
+    # Replay simulated hands card by card through blackjack.Hand.
+    rng = np.random.default_rng(seed)
+    outcome, decks, pos = play_batch(hands, strategy, rng)
+    for i in range(hands):
+        cards = decks[i, :pos[i]].tolist()
+        player, dealer, rest = Hand(cards[:2]), Hand(cards[2:4]), cards[4:]
+        dealer_up = blackjack.CARD_VALUES[cards[2]]
+        while player.value <= 21 and strategy(np.array(player.value), np.array(player.soft_aces > 0),
+                                              np.array(dealer_up)):
+            player.add(rest.pop(0))
+        if player.value > 21:
+            expected = -1
+        else:
+            while dealer.value < DEALER_STANDS_ON:
+                dealer.add(rest.pop(0))
+            expected = 1 if dealer.value > 21 or player.value > dealer.value else \
+                -1 if player.value < dealer.value else 0
+        if rest or expected != outcome[i]:
+            names = [CARD_NAMES[card] for card in cards]
+            raise AssertionError(f"Hand {i} diverged: {names} -> {outcome[i]}, expected {expected}")
+    return hands
+
+
+def benchmark(hands=1_000_000, strategy=basic_strategy, seed=None):
+    start = time.perf_counter()
+    simulate(hands, strategy, seed)
+    elapsed = time.perf_counter() - start
+    return hands / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless blackjack Monte Carlo simulator")
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="basic")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bench", action="store_true", help="report hands per second")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="cross-check N hands against blackjack.Hand first")
+    args = parser.parse_args()
+    strategy = STRATEGIES[args.strategy]
+
+    if args.verify:
+        print(f"Verified {verify(args.verify, strategy, args.seed)} hands against blackjack.Hand.")
+    if args.bench:
+        rate = benchmark(args.hands, strategy, args.seed)
+        print(f"{args.hands} hands ({args.strategy}): {rate:,.0f} hands/sec")
+        return
+
+    result = simulate(args.hands, strategy, args.seed)
+    print(f"Hands: {result['hands']} | Strategy: {args.strategy}")
+    for name in ("win", "push", "loss"):
+        p, lo, hi = result[name]
+        print(f"{name.capitalize():>5}: {p:.4%}  (95% CI {lo:.4%} - {hi:.4%})")
+    ev, lo, hi = result["ev"]
+    print(f"   EV: {ev:+.5f} per unit  (95% CI {lo:+.5f} - {hi:+.5f})")
+
+
+if __name__ == "__main__":
+    main()
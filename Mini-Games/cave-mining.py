@@ -1,6 +1,12 @@
+import argparse
+import os
 import random
 import sys
 
+from alias_sampler import AliasSampler
+from mining_inventory import Inventory
+from mining_save import Session
+
 PICKAXE_UPGRADES = [
     {"name": "Stone", "efficiency": 1, "cost": 0},
     {"name": "Copper", "efficiency": 1.5, "cost": 4},  
@@ -42,17 +48,39 @@ AREAS = [
 
 ORE_TYPES = ["Copper", "Iron", "Gold", "Diamond"]
 
+COAL_CHANCE = 0.05
+COAL_ROLL = AliasSampler([True, False], [COAL_CHANCE, 1 - COAL_CHANCE])
+
+# Menu keys of the Player methods that change the game; the save journal records these.
+GAME_ACTIONS = {
+    "2": "explore",
+    "3": "deposit_backpack",
+    "4": "upgrade_pickaxe",
+    "5": "upgrade_backpack",
+    "6": "upgrade_chest",
+    "7": "shop",
+    "8": "smelt",
+}
+
+SAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cave-mining.sav")
+
 class Player:
-    def __init__(self):
+    __slots__ = ("money", "pickaxe_level", "backpack_level", "chest_level", "backpack", "chest",
+                 "suits", "items", "ingots", "ask", "say")
+
+    # ask and say stand in for input() and print() so scripted players can drive the game.
+    def __init__(self, ask=input, say=print):
         self.money = 0
         self.pickaxe_level = 0
         self.backpack_level = 0
         self.chest_level = 0
-        self.backpack = []
-        self.chest = []
+        self.backpack = Inventory()
+        self.chest = Inventory()
         self.suits = set()
         self.items = set()
         self.ingots = {ore: 0 for ore in ORE_TYPES}
+        self.ask = ask
+        self.say = say
 
     @property
     def pickaxe(self):
@@ -71,94 +99,93 @@ class Player:
         return CHEST_UPGRADES[self.chest_level]["capacity"]
 
     def explore(self):
-        print("\nAreas:")
+        self.say("\nAreas:")
         for idx, area in enumerate(AREAS):
-            print(f"{idx+1}. {area}")
-        choice = input("Choose an area to explore (number): ")
+            self.say(f"{idx+1}. {area}")
+        choice = self.ask("Choose an area to explore (number): ")
         if not choice.isdigit() or not (1 <= int(choice) <= len(AREAS)):
-            print("Invalid choice.")
+            self.say("Invalid choice.")
             return
-        if random.random() < 0.05:
-            print("\nYou discovered a chunk of Coal!")
+        if COAL_ROLL.draw():
+            self.say("\nYou discovered a chunk of Coal!")
             self.items.add("Coal")
             return
         area = AREAS[int(choice)-1]
         ore_type = ORE_TYPES[min(self.pickaxe_level, len(ORE_TYPES)-1)]
         yield_amount = int(random.randint(5, 15) * self.pickaxe_efficiency)
         earnings = yield_amount * 10
-        print(f"\nYou explored {area} and found {yield_amount}kg of {ore_type} ore.")
+        self.say(f"\nYou explored {area} and found {yield_amount}kg of {ore_type} ore.")
         self.money += earnings
-        print(f"You earned ${earnings} from selling surplus ore.")
+        self.say(f"You earned ${earnings} from selling surplus ore.")
         if len(self.backpack) < self.backpack_capacity:
             self.backpack.append((f"{ore_type} Ore", yield_amount))
-            print(f"Ore added to backpack ({len(self.backpack)}/{self.backpack_capacity}).")
+            self.say(f"Ore added to backpack ({len(self.backpack)}/{self.backpack_capacity}).")
         else:
-            print("Backpack full! Deposit to chest or empty backpack.")
+            self.say("Backpack full! Deposit to chest or empty backpack.")
 
     def show_status(self):
-        print("\n=== Status ===")
-        print(f"Money: ${self.money}")
-        print(f"Pickaxe: {self.pickaxe}")
-        print(f"Backpack: {len(self.backpack)}/{self.backpack_capacity}")
-        print(f"Chest: {len(self.chest)}/{self.chest_capacity}")
+        self.say("\n=== Status ===")
+        self.say(f"Money: ${self.money}")
+        self.say(f"Pickaxe: {self.pickaxe}")
+        self.say(f"Backpack: {len(self.backpack)}/{self.backpack_capacity}")
+        self.say(f"Chest: {len(self.chest)}/{self.chest_capacity}")
         ingot_status = ", ".join(f"{ore}: {amt}kg" for ore, amt in self.ingots.items())
-        print(f"Ingots: {ingot_status}")
-        print(f"Suits: {', '.join(self.suits) if self.suits else 'None'}")
-        print(f"Items: {', '.join(self.items) if self.items else 'None'}")
-        print("==============")
+        self.say(f"Ingots: {ingot_status}")
+        self.say(f"Suits: {', '.join(self.suits) if self.suits else 'None'}")
+        self.say(f"Items: {', '.join(self.items) if self.items else 'None'}")
+        self.say("==============")
 
     def deposit_backpack(self):
-        while self.backpack and len(self.chest) < self.chest_capacity:
-            self.chest.append(self.backpack.pop(0))
-        print(f"Deposited items. Chest now {len(self.chest)}/{self.chest_capacity}")
+        self.backpack.move_to(self.chest, self.chest_capacity - len(self.chest))
+        self.say(f"Deposited items. Chest now {len(self.chest)}/{self.chest_capacity}")
 
     def upgrade_pickaxe(self):
         next_level = self.pickaxe_level + 1
         if next_level >= len(PICKAXE_UPGRADES):
-            print("Your pickaxe is at max level.")
+            self.say("Your pickaxe is at max level.")
             return
         ore_type = PICKAXE_UPGRADES[next_level]["name"]
         cost = PICKAXE_UPGRADES[next_level]["cost"]
         if self.ingots.get(ore_type, 0) >= cost:
             self.ingots[ore_type] -= cost
             self.pickaxe_level = next_level
-            print(f"Upgraded pickaxe to {self.pickaxe}.")
+            self.say(f"Upgraded pickaxe to {self.pickaxe}.")
         else:
-            print(f"Need {cost}kg of {ore_type} ingots to upgrade pickaxe.")
+            self.say(f"Need {cost}kg of {ore_type} ingots to upgrade pickaxe.")
 
     def upgrade_backpack(self):
         next_level = self.backpack_level + 1
         if next_level >= len(BACKPACK_UPGRADES):
-            print("Backpack is at max capacity.")
+            self.say("Backpack is at max capacity.")
             return
         cost = BACKPACK_UPGRADES[next_level]["cost"]
         if self.money >= cost:
             self.money -= cost
             self.backpack_level = next_level
-            print(f"Upgraded backpack to capacity {self.backpack_capacity}.")
+            self.say(f"Upgraded backpack to capacity {self.backpack_capacity}.")
         else:
-            print(f"Need ${cost} to upgrade backpack.")
+            self.say(f"Need ${cost} to upgrade backpack.")
 
     def upgrade_chest(self):
         next_level = self.chest_level + 1
         if next_level >= len(CHEST_UPGRADES):
-            print("Chest is at max capacity.")
+            self.say("Chest is at max capacity.")
             return
         cost = CHEST_UPGRADES[next_level]["cost"]
         if self.money >= cost:
             self.money -= cost
             self.chest_level = next_level
-            print(f"Upgraded chest to capacity {self.chest_capacity}.")
+            self.say(f"Upgraded chest to capacity {self.chest_capacity}.")
         else:
-            print(f"Need ${cost} to upgrade chest.")
+            self.say(f"Need ${cost} to upgrade chest.")
 
     def shop(self):
-        print("\n=== Shop ===")
+        self.say("\n=== Shop ===")
         for idx, (item, cost) in enumerate(SHOP_ITEMS.items(), 1):
-            print(f"{idx}. {item} - ${cost}")
-        choice = input("Choose item to buy (number): ")
+            self.say(f"{idx}. {item} - ${cost}")
+        choice = self.ask("Choose item to buy (number): ")
         if not choice.isdigit() or not (1 <= int(choice) <= len(SHOP_ITEMS)):
-            print("Invalid choice.")
+            self.say("Invalid choice.")
             return
         item = list(SHOP_ITEMS.keys())[int(choice)-1]
         cost = SHOP_ITEMS[item]
@@ -168,69 +195,59 @@ class Player:
                 self.suits.add(item)
             else:
                 self.items.add(item)
-            print(f"Purchased {item}.")
+            self.say(f"Purchased {item}.")
         else:
-            print("Not enough money.")
+            self.say("Not enough money.")
 
     def smelt(self):
         if "Coal" not in self.items and "Lava Bucket" not in self.items:
-            print("You need Coal or a Lava Bucket to fuel the furnace.")
+            self.say("You need Coal or a Lava Bucket to fuel the furnace.")
             return
-        ore_inventory = {}
-        for typ, amt in self.chest:
-            if "Ore" in typ:
-                ore_type = typ.replace(" Ore", "")
-                ore_inventory[ore_type] = ore_inventory.get(ore_type, 0) + amt
+        ore_inventory = {typ.replace(" Ore", ""): amt for typ, amt in self.chest.totals().items() if "Ore" in typ}
         if not ore_inventory:
-            print("No ore in chest to smelt.")
+            self.say("No ore in chest to smelt.")
             return
-        print("\nOre in Chest:")
+        self.say("\nOre in Chest:")
         for idx, (ore, amt) in enumerate(ore_inventory.items(), 1):
-            print(f"{idx}. {ore} Ore - {amt}kg")
-        choice = input("Choose ore to smelt (number): ")
+            self.say(f"{idx}. {ore} Ore - {amt}kg")
+        choice = self.ask("Choose ore to smelt (number): ")
         if not choice.isdigit() or not (1 <= int(choice) <= len(ore_inventory)):
-            print("Invalid choice.")
+            self.say("Invalid choice.")
             return
         ore_type = list(ore_inventory.keys())[int(choice)-1]
         available = ore_inventory[ore_type]
-        amount = input(f"Enter kg of {ore_type} Ore to smelt (max {available}): ")
+        amount = self.ask(f"Enter kg of {ore_type} Ore to smelt (max {available}): ")
         if not amount.isdigit() or not (1 <= int(amount) <= available):
-            print("Invalid amount.")
+            self.say("Invalid amount.")
             return
         amount = int(amount)
-        removed = 0
-        new_chest = []
-        for typ, amt in self.chest:
-            if typ == f"{ore_type} Ore" and removed < amount:
-                take = min(amt, amount - removed)
-                leftover = amt - take
-                removed += take
-                if leftover > 0:
-                    new_chest.append((typ, leftover))
-            else:
-                new_chest.append((typ, amt))
-        self.chest = new_chest
+        self.chest.remove(f"{ore_type} Ore", amount)
         if "Coal" in self.items:
             self.items.remove("Coal")
         else:
             self.items.remove("Lava Bucket")
         self.ingots[ore_type] += amount
-        print(f"Smelted {amount}kg of {ore_type} Ore into {amount}kg of {ore_type} Ingots.")
+        self.say(f"Smelted {amount}kg of {ore_type} Ore into {amount}kg of {ore_type} Ingots.")
 
 
 def main():
-    player = Player()
-    actions = {
-        "1": player.show_status,
-        "2": player.explore,
-        "3": player.deposit_backpack,
-        "4": player.upgrade_pickaxe,
-        "5": player.upgrade_backpack,
-        "6": player.upgrade_chest,
-        "7": player.shop,
-        "8": player.smelt,
-        "0": lambda: sys.exit(0)
-    }
+    parser = argparse.ArgumentParser(description="Cave mining")
+    parser.add_argument("--save", default=SAVE_FILE, help="save file (a journal is kept next to it)")
+    parser.add_argument("--new", action="store_true", help="start over instead of loading the save")
+    args = parser.parse_args()
+
+    session = Session(args.save, sys.modules[__name__], new=args.new)
+    player = session.player
+    if session.seq and not args.new:
+        print(f"Loaded saved game ({session.replayed} unsaved actions recovered).")
+
+    def leave():
+        session.close()
+        sys.exit(0)
+
+    actions = {"1": player.show_status, "0": leave}
+    for key in GAME_ACTIONS:
+        actions[key] = lambda key=key: session.run(key)
 
     while True:
         print("""
@@ -0,0 +1,23 @@
+import random
+
+CRASH_MIN = 1.1
+CRASH_MAX = 10.0
+STEP_MIN = 0.05
+STEP_MAX = 0.25
+START_MULTIPLIER = 1.0
+
+# The walk only climbs, so no round can outlast a crash point of CRASH_MAX.
+MAX_TICKS = int(round((CRASH_MAX - START_MULTIPLIER) / STEP_MIN))
+
+
+def draw_crash_point(rng=random):
+    return round(rng.uniform(CRASH_MIN, CRASH_MAX), 2)
+
+
+def next_multiplier(multiplier, rng=random):
+    return round(multiplier + rng.uniform(STEP_MIN, STEP_MAX), 2)
+
+
+def has_crashed(multiplier, crash_point):
+    # Checked after the player had their chance to cash out at this tick.
+    return multiplier >= crash_point
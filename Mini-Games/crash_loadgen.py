@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.cashed = 0
+        self.errors = 0
+        self.connected = 0
+
+
+async def client(host, port, stats, stop, bet, active):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.errors += 1
+        return
+    stats.connected += 1
+    target = None
+    try:
+        while not stop.is_set():
+            line = await reader.readline()
+            if not line:
+                break
+            received = time.time()
+            event, *fields = line.decode().split()
+            if event == "TICK":
+                stats.latencies.append(received - float(fields[2]))
+                if target is not None and float(fields[1]) >= target:
+                    writer.write(b"CASH\n")
+                    target = None
+            elif event == "BETTING" and active:
+                writer.write(f"BET {bet}\n".encode())
+                target = round(random.uniform(1.2, 4.0), 2)
+            elif event == "CASHED":
+                stats.cashed += 1
+            elif event == "CRASH":
+                target = None
+    except ConnectionError:
+        stats.errors += 1
+    finally:
+        writer.close()
+
+
+def raise_fd_limit(wanted):
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        limit = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+
+
+async def run(host, port, clients, active_share, duration, bet):
+    stats = Stats()
+    stop = asyncio.Event()
+    tasks = []
+    for i in range(clients):
+        active = i < clients * active_share
+        tasks.append(asyncio.create_task(client(host, port, stats, stop, bet, active)))
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    await asyncio.sleep(duration)
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats
+
+
+def report(stats, duration):
+    print(f"Connections: {stats.connected} | Errors: {stats.errors} | Cash-outs: {stats.cashed}")
+    if not stats.latencies:
+        print("No ticks received.")
+        return
+    latencies = sorted(stats.latencies)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    print(f"Ticks delivered: {len(latencies)} ({len(latencies) / duration:,.0f}/sec)")
+    print(f"Tick fan-out latency: mean {statistics.fmean(latencies) * 1000:.2f} ms | "
+          f"p50 {pct(50):.2f} ms | p95 {pct(95):.2f} ms | p99 {pct(99):.2f} ms | max {latencies[-1] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for crash_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--active", type=float, default=0.25, help="share of clients that bet every round")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--bet", type=float, default=1.0)
+    args = parser.parse_args()
+
+    raise_fd_limit(args.clients + 64)
+    stats = asyncio.run(run(args.host, args.port, args.clients, args.active, args.duration, args.bet))
+    report(stats, args.duration)
+
+
+if __name__ == "__main__":
+    main()
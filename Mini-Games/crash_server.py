@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import itertools
+import math
+import time
+
+from crash_engine import START_MULTIPLIER, draw_crash_point, has_crashed, next_multiplier
+
+# Line protocol, one command or event per line.
+#   client -> server: BET <amount> | CASH | QUIT
+#   server -> client: WELCOME <id> <balance> | BETTING <round> <seconds> | START <round>
+#                     TICK <round> <multiplier> <unix time> | CASHED <round> <multiplier> <winnings> <balance>
+#                     CRASH <round> <crash point> | BALANCE <balance> | ERR <reason>
+
+STARTING_BALANCE = 100.0
+MAX_WRITE_BUFFER = 64 * 1024  # drop readers that stop draining the tick stream
+
+
+class Player:
+    __slots__ = ("id", "writer", "balance", "bet", "cashed")
+
+    def __init__(self, player_id, writer):
+        self.id = player_id
+        self.writer = writer
+        self.balance = STARTING_BALANCE
+        self.bet = 0.0
+        self.cashed = False
+
+
+class CrashServer:
+    def __init__(self, tick_interval=0.5, betting_window=3.0):
+        self.tick_interval = tick_interval
+        self.betting_window = betting_window
+        self.players = {}
+        self.ids = itertools.count(1)
+        self.round_id = 0
+        self.betting = False
+        self.running = False
+        self.multiplier = START_MULTIPLIER
+
+    def send(self, player, line):
+        player.writer.write(line.encode() + b"\n")
+
+    def broadcast(self, line):
+        data = line.encode() + b"\n"
+        for player in list(self.players.values()):
+            transport = player.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                self.drop(player)
+            else:
+                player.writer.write(data)
+
+    def drop(self, player):
+        self.players.pop(player.id, None)
+        player.writer.close()
+
+    async def handle(self, reader, writer):
+        player = Player(next(self.ids), writer)
+        self.players[player.id] = player
+        self.send(player, f"WELCOME {player.id} {player.balance:.2f}")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, arg = line.decode(errors="replace").strip().partition(" ")
+                command = command.upper()
+                if command == "BET":
+                    self.place_bet(player, arg)
+                elif command == "CASH":
+                    self.cash_out(player)
+                elif command == "QUIT":
+                    break
+                else:
+                    self.send(player, "ERR unknown command")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.drop(player)
+
+    def place_bet(self, player, arg):
+        if not self.betting:
+            return self.send(player, "ERR betting closed")
+        try:
+            bet = float(arg)
+        except ValueError:
+            return self.send(player, "ERR invalid bet")
+        if not math.isfinite(bet) or bet <= 0 or bet > player.balance + player.bet:
+            return self.send(player, "ERR invalid bet amount")
+        player.balance -= bet - player.bet
+        player.bet = bet
+        self.send(player, f"BALANCE {player.balance:.2f}")
+
+    def cash_out(self, player):
+        if not self.running or not player.bet or player.cashed:
+            return self.send(player, "ERR nothing to cash out")
+        # Settled at the tick the command arrived in, before that tick's crash check.
+        winnings = round(player.bet * self.multiplier, 2)
+        player.balance += winnings
+        player.cashed = True
+        self.send(player, f"CASHED {self.round_id} {self.multiplier} {winnings:.2f} {player.balance:.2f}")
+
+    async def play_round(self):
+        loop = asyncio.get_running_loop()
+        self.round_id += 1
+        for player in self.players.values():
+            player.bet = 0.0
+            player.cashed = False
+
+        self.betting = True
+        self.broadcast(f"BETTING {self.round_id} {self.betting_window}")
+        await asyncio.sleep(self.betting_window)
+        self.betting = False
+
+        crash_point = draw_crash_point()
+        self.multiplier = START_MULTIPLIER
+        self.broadcast(f"START {self.round_id}")
+        deadline = loop.time()
+        while True:
+            deadline += self.tick_interval
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            # Players had the whole interval to cash out at the previous tick's multiplier.
+            if has_crashed(self.multiplier, crash_point):
+                break
+            self.multiplier = next_multiplier(self.multiplier)
+            self.broadcast(f"TICK {self.round_id} {self.multiplier} {time.time():.6f}")
+            # Cash-outs open with the first tick; before it one would just refund the bet.
+            self.running = True
+        self.running = False
+        self.broadcast(f"CRASH {self.round_id} {crash_point}")
+        for player in self.players.values():
+            if player.bet and not player.cashed:
+                self.send(player, f"BALANCE {player.balance:.2f}")
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        print(f"Crash server listening on {host}:{port}")
+        async with server:
+            while True:
+                await self.play_round()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multiplayer Crash round server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick", type=float, default=0.5, help="seconds between multiplier ticks")
+    parser.add_argument("--betting", type=float, default=3.0, help="seconds the betting window stays open")
+    args = parser.parse_args()
+    try:
+        asyncio.run(CrashServer(args.tick, args.betting).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
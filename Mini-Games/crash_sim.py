@@ -0,0 +1,157 @@
+import argparse
+import time
+
+import numpy as np
+
+from crash_engine import CRASH_MAX, CRASH_MIN, MAX_TICKS, START_MULTIPLIER, STEP_MAX, STEP_MIN
+
+STARTING_BALANCE = 100.0
+BATCH_SIZE = 100_000
+
+# Rounds are simulated in integer cents, matching the game's 2-decimal rounding.
+
+
+def draw_crash_points(rng, n):
+    return np.rint(rng.uniform(CRASH_MIN, CRASH_MAX, n) * 100).astype(np.int16)
+
+
+def draw_walks(rng, n, ticks=MAX_TICKS):
+    steps = np.rint(rng.uniform(STEP_MIN * 100, STEP_MAX * 100, (n, ticks))).astype(np.int16)
+    steps[:, 0] += int(START_MULTIPLIER * 100)
+    return np.cumsum(steps, axis=1, dtype=np.int16)
+
+
+def first_tick_at_least(walks, cents):
+    # Index of the first tick whose multiplier reaches cents, or MAX_TICKS if none does.
+    reached = walks >= np.asarray(cents).reshape(-1, 1)
+    return np.where(reached.any(axis=1), reached.argmax(axis=1), walks.shape[1])
+
+
+def settle(walks, crash_points, cashout_ticks):
+    # Multiplier paid per round, or 0.0 where the round crashed first. A cash-out on
+    # the crash tick still pays, as in crash_game().
+    crash_ticks = first_tick_at_least(walks, crash_points)
+    won = cashout_ticks <= crash_ticks
+    ticks = np.minimum(cashout_ticks, walks.shape[1] - 1)
+    paid = walks[np.arange(len(walks)), ticks] / 100.0
+    return np.where(won, paid, 0.0)
+
+
+class FixedTarget:
+    def __init__(self, target):
+        self.target = target
+
+    def cashout_ticks(self, walks):
+        return first_tick_at_least(walks, int(round(self.target * 100)))
+
+    def next_bets(self, bets, base_bet, won):
+        return np.full_like(bets, base_bet)
+
+    def __str__(self):
+        return f"fixed x{self.target}"
+
+
+class TickLimit:
+    def __init__(self, ticks):
+        self.ticks = ticks
+
+    def cashout_ticks(self, walks):
+        return np.full(len(walks), self.ticks - 1)
+
+    def next_bets(self, bets, base_bet, won):
+        return np.full_like(bets, base_bet)
+
+    def __str__(self):
+        return f"after {self.ticks} ticks"
+
+
+class Martingale(FixedTarget):
+    def __init__(self, target, factor=2.0):
+        super().__init__(target)
+        self.factor = factor
+
+    def next_bets(self, bets, base_bet, won):
+        return np.where(won, base_bet, bets * self.factor)
+
+    def __str__(self):
+        return f"martingale x{self.target} (factor {self.factor})"
+
+
+def rtp(strategy, rounds, seed=None, batch_size=BATCH_SIZE):
+    rng = np.random.default_rng(seed)
+    returned = 0.0
+    wins = 0
+    remaining = rounds
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        walks = draw_walks(rng, n)
+        paid = settle(walks, draw_crash_points(rng, n), strategy.cashout_ticks(walks))
+        returned += paid.sum()
+        wins += np.count_nonzero(paid)
+        remaining -= n
+    return returned / rounds, wins / rounds
+
+
+def bankrolls(strategy, sessions, rounds, base_bet=1.0, balance=STARTING_BALANCE, seed=None):
+    # Play every session side by side; a session stops once it cannot cover a bet.
+    rng = np.random.default_rng(seed)
+    balances = np.full(sessions, balance)
+    bets = np.full(sessions, base_bet)
+    busted = np.zeros(sessions, dtype=bool)
+    for _ in range(rounds):
+        stakes = np.where(busted, 0.0, np.minimum(bets, balances))
+        walks = draw_walks(rng, sessions)
+        paid = settle(walks, draw_crash_points(rng, sessions), strategy.cashout_ticks(walks))
+        balances += stakes * paid - stakes
+        bets = strategy.next_bets(bets, base_bet, paid > 0)
+        busted |= balances <= 0
+    return balances, busted
+
+
+def benchmark(strategy, rounds=1_000_000, seed=None):
+    start = time.perf_counter()
+    rtp(strategy, rounds, seed)
+    return rounds / (time.perf_counter() - start)
+
+
+def parse_strategy(text):
+    kind, _, value = text.partition(":")
+    if kind == "fixed":
+        return FixedTarget(float(value or 2.0))
+    if kind == "ticks":
+        return TickLimit(int(value or 5))
+    if kind == "martingale":
+        return Martingale(float(value or 2.0))
+    raise argparse.ArgumentTypeError(f"unknown strategy {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Crash simulator")
+    parser.add_argument("--strategy", type=parse_strategy, default=FixedTarget(2.0),
+                        help="fixed:<target>, ticks:<n> or martingale:<target>")
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--session-rounds", type=int, default=100)
+    parser.add_argument("--bet", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bench", action="store_true", help="report rounds per second")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(f"{args.rounds} rounds ({args.strategy}): {benchmark(args.strategy, args.rounds, args.seed):,.0f} rounds/sec")
+        return
+
+    ret, win_rate = rtp(args.strategy, args.rounds, args.seed)
+    print(f"Strategy: {args.strategy}")
+    print(f"Return to player: {ret:.4%} | Win rate: {win_rate:.2%} over {args.rounds} rounds")
+
+    balances, busted = bankrolls(args.strategy, args.sessions, args.session_rounds, args.bet, seed=args.seed)
+    percentiles = np.percentile(balances, [5, 25, 50, 75, 95])
+    print(f"\nBankroll after {args.session_rounds} rounds ({args.sessions} sessions, "
+          f"start ${STARTING_BALANCE:.2f}, base bet ${args.bet:.2f}):")
+    print("  " + " | ".join(f"p{p}: ${v:.2f}" for p, v in zip((5, 25, 50, 75, 95), percentiles)))
+    print(f"  Mean: ${balances.mean():.2f} | Busted: {busted.mean():.2%}")
+
+
+if __name__ == "__main__":
+    main()
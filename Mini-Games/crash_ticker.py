@@ -0,0 +1,79 @@
+import queue
+import statistics
+import sys
+import threading
+import time
+
+
+class LineReader:
+    # Reads stdin on a daemon thread so the game loop never blocks on input().
+    def __init__(self, stream=sys.stdin):
+        self.lines = queue.Queue()
+        self.thread = threading.Thread(target=self._run, args=(stream,), daemon=True)
+        self.thread.start()
+
+    def _run(self, stream):
+        for line in iter(stream.readline, ""):
+            self.lines.put((time.monotonic(), line.rstrip("\n")))
+        self.lines.put((time.monotonic(), None))
+
+    def input(self, prompt=""):
+        print(prompt, end="", flush=True)
+        _, line = self.lines.get()
+        if line is None:
+            raise EOFError
+        return line
+
+    def wait(self, deadline):
+        # Next (arrival time, line) before the monotonic deadline, or None.
+        timeout = deadline - time.monotonic()
+        try:
+            if timeout <= 0:
+                return self.lines.get_nowait()
+            return self.lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def discard_pending(self):
+        while True:
+            try:
+                item = self.lines.get_nowait()
+            except queue.Empty:
+                return
+            if item[1] is None:
+                # Keep end of input queued so the next input() still raises EOFError.
+                self.lines.put(item)
+                return
+
+
+class JitterStats:
+    def __init__(self):
+        self.samples = []
+
+    def record(self, scheduled, actual):
+        self.samples.append(actual - scheduled)
+
+    def summary(self):
+        if not self.samples:
+            return "no ticks recorded"
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return (f"{len(ordered)} ticks, mean {statistics.fmean(ordered) * 1000:.2f} ms, "
+                f"p95 {p95 * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms late")
+
+
+class Ticker:
+    # Tick k is due at start + k / rate, so a late tick never pushes the next one back.
+    def __init__(self, rate, stats=None):
+        self.interval = 1.0 / rate
+        self.stats = stats if stats is not None else JitterStats()
+        self.start = time.monotonic()
+        self.count = 0
+
+    @property
+    def next_deadline(self):
+        return self.start + (self.count + 1) * self.interval
+
+    def fire(self):
+        self.count += 1
+        self.stats.record(self.start + self.count * self.interval, time.monotonic())
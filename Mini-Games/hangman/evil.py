@@ -0,0 +1,78 @@
+import argparse
+import random
+import time
+
+import word_store
+
+# For each letter, a table that blanks every other letter, so word.translate(table) is
+# the pattern a guess of that letter would show ("_PP__" for APPLE and P).
+_BLANK_OTHERS = {letter: str.maketrans({c: "_" for c in word_store.LETTERS if c != letter})
+                 for letter in word_store.LETTERS}
+
+
+def partition(words, letter):
+    # Families of words that would show the same pattern for this guess, in one pass.
+    table = _BLANK_OTHERS[letter]
+    families = {}
+    for word in words:
+        key = word.translate(table)
+        family = families.get(key)
+        if family is None:
+            families[key] = [word]
+        else:
+            family.append(word)
+    return families
+
+
+class EvilWords:
+    # The word is never fixed: each guess keeps the largest family of candidates, and
+    # among equal families the one that reveals the fewest letters.
+    __slots__ = ("candidates", "latencies")
+
+    def __init__(self, words):
+        self.candidates = list(words)
+        self.latencies = []
+
+    @property
+    def word(self):
+        return self.candidates[0]
+
+    def guess(self, letter):
+        start = time.perf_counter()
+        families = partition(self.candidates, letter)
+        _, self.candidates = max(families.items(), key=lambda item: (len(item[1]), item[0].count("_")))
+        self.latencies.append(time.perf_counter() - start)
+        return self.word
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evil Hangman partition latency")
+    parser.add_argument("--length", type=int, default=8)
+    parser.add_argument("--words", type=int, default=1_000_000, help="size of the synthetic dictionary")
+    parser.add_argument("--guesses", default="ESIARNTOLCUDPMHGBFYWKVXZJQ")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    store = word_store.load()
+    base = list(store)
+    synthetic = {}
+    for _ in range(args.words):
+        word = base[rng.randrange(len(base))]
+        word += "".join(rng.choice(word_store.LETTERS) for _ in range(rng.randrange(4)))
+        synthetic.setdefault(len(word), []).append(word)
+
+    for name, words in (("words.txt", store.sections[args.length]), ("synthetic", synthetic[args.length])):
+        evil = EvilWords(words)
+        print(f"\n{name}: {len(words):,} {args.length}-letter words")
+        for letter in args.guesses:
+            before = len(evil.candidates)
+            pattern = evil.guess(letter).translate(_BLANK_OTHERS[letter])
+            print(f"  {letter}: {before:>9,} -> {len(evil.candidates):>9,} {pattern} "
+                  f"in {evil.latencies[-1] * 1000:8.2f} ms")
+            if len(evil.candidates) == 1:
+                break
+        print(f"  total partition time {sum(evil.latencies) * 1000:.1f} ms over {len(evil.latencies)} guesses")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,36 @@
+import argparse
 import tkinter as tk
-from random import choice
+
+import word_store
+from evil import EvilWords
+
+try:
+    from solver import MAX_LENGTH, Solver
+    SOLVER_AVAILABLE = True
+except ImportError:
+    SOLVER_AVAILABLE = False
 
 class HangmanGame:
-    def __init__(self, root):
+    def __init__(self, root, length=None, difficulty=None, evil=False):
         self.root = root
-        self.root.title("Hangman Game")
+        self.root.title("Evil Hangman" if evil else "Hangman Game")
         self.canvas = tk.Canvas(root, width=400, height=400)
         self.canvas.pack()
         self.word_list = self.load_words()
-        self.word = choice(self.word_list).upper()
+        self.word = self.word_list.random_word(length, difficulty)
+        # In evil mode self.word is only a representative of the words still possible.
+        self.evil = None
+        if evil:
+            self.evil = EvilWords(self.word_list.sections[len(self.word)])
+            self.word = self.evil.word
         self.guesses = []
         self.mistakes = 0
         self.max_mistakes = 6
         self.setup_ui()
 
     def load_words(self):
-        with open("games/hangman/words.txt", "r") as file:
-            words = file.read().splitlines()
-        return words
+        # Shared, indexed and cached for the whole process (see word_store).
+        return word_store.load()
 
     def setup_ui(self):
         self.word_display = tk.StringVar()
@@ -27,6 +40,11 @@ class HangmanGame:
         self.letter_frame = tk.Frame(self.root)
         self.letter_frame.pack(pady=20)
         self.create_letter_buttons()
+        if SOLVER_AVAILABLE:
+            self.hint_text = tk.StringVar()
+            self.hint_button = tk.Button(self.root, text="Hint", font=("Helvetica", 14), command=self.show_hint)
+            self.hint_button.pack()
+            tk.Label(self.root, textvariable=self.hint_text, font=("Helvetica", 12)).pack(pady=5)
         self.draw_hangman()
 
     def create_letter_buttons(self):
@@ -34,6 +52,14 @@ class HangmanGame:
             button = tk.Button(self.letter_frame, text=letter, font=("Helvetica", 18), width=4, command=lambda l=letter: self.check_guess(l))
             button.grid(row=(ord(letter) - 65) // 9, column=(ord(letter) - 65) % 9)
 
+    def show_hint(self):
+        if len(self.word) > MAX_LENGTH:
+            return self.hint_text.set("No hints for words this long")
+        solver = Solver.from_game(self)
+        letter = solver.best_letter()
+        if letter:
+            self.hint_text.set(f"Try {letter} ({len(solver.candidates)} possible words)")
+
     def update_word_display(self):
         display = " ".join([letter if letter in self.guesses else "_" for letter in self.word])
         self.word_display.set(display)
@@ -42,6 +68,8 @@ class HangmanGame:
         if guess in self.guesses or not guess.isalpha():
             return
         self.guesses.append(guess)
+        if self.evil:
+            self.word = self.evil.guess(guess)
         button = self.letter_frame.grid_slaves(row=(ord(guess) - 65) // 9, column=(ord(guess) - 65) % 9)[0]
         button.config(state="disabled", disabledforeground="grey")
         if guess not in self.word:
@@ -78,11 +106,21 @@ class HangmanGame:
             self.end_game(f"Game Over! The word was {self.word}")
 
     def end_game(self, message):
+        if self.evil:
+            times = self.evil.latencies
+            message += f"\n(avg partition {sum(times) / len(times) * 1000:.2f} ms, max {max(times) * 1000:.2f} ms)"
         for button in self.letter_frame.winfo_children():
             button.config(state="disabled")
+        if SOLVER_AVAILABLE:
+            self.hint_button.config(state="disabled")
         self.label.config(text=message)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hangman")
+    parser.add_argument("--length", type=int, default=None, help="only pick words of this length")
+    parser.add_argument("--difficulty", choices=word_store.DIFFICULTIES, default=None)
+    parser.add_argument("--evil", action="store_true", help="the word keeps changing to dodge your guesses")
+    args = parser.parse_args()
     root = tk.Tk()
-    game = HangmanGame(root)
+    game = HangmanGame(root, args.length, args.difficulty, args.evil)
     root.mainloop()
\ No newline at end of file
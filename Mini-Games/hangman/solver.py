@@ -0,0 +1,164 @@
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+import word_store
+
+STRATEGIES = ("entropy", "minimax")
+MAX_MISTAKES = 6
+# Position masks are uint64, and scores() packs the letter (5 bits) above them.
+MAX_LENGTH = 59
+
+
+@lru_cache(maxsize=None)
+def position_bits(store, length):
+    # One row per word of this length: column c holds the positions of letter c as a
+    # bitmask (bit p set when the word has c at position p), 0 when c is absent.
+    if length > MAX_LENGTH:
+        raise ValueError(f"words longer than {MAX_LENGTH} letters are not supported")
+    words = store.sections.get(length, ())
+    codes = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(len(words), length) - 65
+    bits = np.zeros((len(words), 26), dtype=np.uint64)
+    rows = np.arange(len(words))
+    for p in range(length):
+        bits[rows, codes[:, p]] |= np.uint64(1 << p)
+    return bits
+
+
+class Solver:
+    # Candidate words consistent with every guess so far. A guess reveals exactly the
+    # positions of its letter (none for a miss), so filtering is one comparison of that
+    # letter's column against the revealed bitmask.
+    def __init__(self, store, length):
+        self.store = store
+        self.length = length
+        self.bits = position_bits(store, length)
+        self.candidates = np.arange(len(self.bits))
+        self.guessed = set()
+
+    @classmethod
+    def from_game(cls, game):
+        solver = cls(game.word_list, len(game.word))
+        solver.sync(game.guesses, game.word_display.get())
+        return solver
+
+    def sync(self, guesses, display):
+        # Rebuild from HangmanGame.guesses and its "A _ _ L E" word display.
+        shown = display.split(" ")
+        self.candidates = np.arange(len(self.bits))
+        self.guessed = set()
+        for letter in guesses:
+            self.update(letter, sum(1 << p for p, ch in enumerate(shown) if ch == letter))
+        return self
+
+    def update(self, letter, revealed):
+        c = ord(letter) - 65
+        self.guessed.add(letter)
+        self.candidates = self.candidates[self.bits[self.candidates, c] == revealed]
+
+    def words(self):
+        words = self.store.sections[self.length]
+        return [words[i] for i in self.candidates.tolist()]
+
+    def scores(self):
+        # Partition the candidates by each letter's reveal pattern in one pass:
+        # returns per-letter entropy (bits), largest family and miss-family sizes.
+        sub = self.bits[self.candidates]
+        k = len(sub)
+        keys = (sub + (np.arange(26, dtype=np.uint64) << np.uint64(self.length))).ravel()
+        families, sizes = np.unique(keys, return_counts=True)
+        letters = (families >> np.uint64(self.length)).astype(np.intp)
+        p = sizes / k
+        entropy = np.bincount(letters, weights=-p * np.log2(p), minlength=26)
+        largest = np.zeros(26, dtype=np.int64)
+        np.maximum.at(largest, letters, sizes)
+        misses = (sub == 0).sum(axis=0)
+        return entropy, largest, misses
+
+    def best_letter(self, strategy="entropy"):
+        if not len(self.candidates):
+            return None
+        entropy, largest, misses = self.scores()
+        open_letters = np.array([chr(65 + c) not in self.guessed for c in range(26)])
+        if strategy == "entropy":
+            # Most information; among equals, the letter least likely to miss.
+            order = np.lexsort((misses, -entropy))
+        elif strategy == "minimax":
+            # Smallest worst-case family, then fewest misses, then most information.
+            order = np.lexsort((-entropy, misses, largest))
+        else:
+            raise ValueError(f"strategy must be one of {STRATEGIES}")
+        for c in order:
+            if open_letters[c] and misses[c] < len(self.candidates):
+                return chr(65 + c)
+        return None
+
+
+def play(store, word, strategy="entropy", max_mistakes=MAX_MISTAKES):
+    # Headless game against a known word; returns (won, mistakes).
+    solver = Solver(store, len(word))
+    hidden = set(word)
+    mistakes = 0
+    while hidden and mistakes < max_mistakes:
+        letter = solver.best_letter(strategy)
+        if letter is None:
+            break
+        revealed = sum(1 << p for p, ch in enumerate(word) if ch == letter)
+        solver.update(letter, revealed)
+        if revealed:
+            hidden.discard(letter)
+        else:
+            mistakes += 1
+    return not hidden, mistakes
+
+
+def benchmark(store, strategy, max_mistakes=MAX_MISTAKES):
+    wins = 0
+    mistakes = 0
+    games = 0
+    start = time.perf_counter()
+    for word in store:
+        won, missed = play(store, word, strategy, max_mistakes)
+        wins += won
+        mistakes += missed
+        games += 1
+    elapsed = time.perf_counter() - start
+    print(f"{strategy:>8}: won {wins}/{games} ({wins / games:.2%}) | average mistakes {mistakes / games:.2f} "
+          f"of {max_mistakes} | solved in {elapsed:.2f}s ({games / elapsed:,.0f} games/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hangman solver")
+    parser.add_argument("--strategy", choices=STRATEGIES + ("all",), default="all")
+    parser.add_argument("--word", default=None, help="show the solver's guesses for one word")
+    parser.add_argument("--max-mistakes", type=int, default=MAX_MISTAKES)
+    parser.add_argument("--path", default=word_store.WORDS_FILE)
+    args = parser.parse_args()
+    store = word_store.load(args.path)
+    strategies = STRATEGIES if args.strategy == "all" else (args.strategy,)
+
+    if args.word:
+        word = args.word.upper()
+        for strategy in strategies:
+            solver = Solver(store, len(word))
+            steps = []
+            while set(word) - solver.guessed and len(solver.guessed - set(word)) < args.max_mistakes:
+                letter = solver.best_letter(strategy)
+                if letter is None:
+                    break
+                solver.update(letter, sum(1 << p for p, ch in enumerate(word) if ch == letter))
+                steps.append(f"{letter}({len(solver.candidates)})")
+            print(f"{strategy:>8}: " + " ".join(steps))
+        return
+    start = time.perf_counter()
+    for length in store.lengths:
+        position_bits(store, length)
+    print(f"Position bitsets for {len(store):,} words built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for strategy in strategies:
+        benchmark(store, strategy, args.max_mistakes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from word_store import (PACK_HEADER, PACK_MAGIC, PACK_SECTION, PACK_VERSION, WORDS_FILE, LETTERS, WordStore,
+                        pack_path, read_pack, read_sections)
+
+
+def compile_pack(source=WORDS_FILE, dest=None, rejected=None):
+    # One-time conversion of a text dictionary into the mmap-able pack word_store reads.
+    # The pack records the source's mtime and size so a stale pack is never used. Packs
+    # are A-Z only; words with other letters are left out and collected in `rejected`.
+    dest = dest or pack_path(source)
+    sections = read_sections(source, rejected)
+    stat = os.stat(source)
+    lengths = sorted(sections)
+    offset = PACK_HEADER.size + PACK_SECTION.size * len(lengths)
+    table = []
+    for length in lengths:
+        table.append(PACK_SECTION.pack(length, len(sections[length]), offset))
+        offset += length * len(sections[length])
+    tmp = dest + ".tmp"
+    with open(tmp, "wb") as file:
+        file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(lengths), sum(map(len, sections.values())),
+                                    stat.st_mtime_ns, stat.st_size))
+        file.write(b"".join(table))
+        for length in lengths:
+            file.write("".join(sections[length]).encode("ascii"))
+    os.replace(tmp, dest)
+    return dest
+
+
+def _measure(load):
+    start = time.perf_counter()
+    store = load()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    kept = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store, kept, elapsed, size
+
+
+def benchmark(sizes=(100_000, 1_000_000, 3_000_000), seed=1):
+    rng = random.Random(seed)
+    base = list(WordStore(read_sections(WORDS_FILE)))
+    print(f"{'Words':>10} {'Text load':>10} {'Text MB':>8} {'Compile':>8} {'Pack open':>10} {'Pack KB':>8} "
+          f"{'File MB':>8} {'Lookup':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for size in sizes:
+            source = os.path.join(folder, f"words{size}.txt")
+            with open(source, "w") as file:
+                for _ in range(size):
+                    word = base[rng.randrange(len(base))]
+                    file.write(word + "".join(rng.choice(LETTERS) for _ in range(rng.randrange(4))) + "\n")
+            _, _, text_time, text_bytes = _measure(lambda: WordStore(read_sections(source)))
+            start = time.perf_counter()
+            dest = compile_pack(source)
+            compile_time = time.perf_counter() - start
+            store, _, pack_time, pack_bytes = _measure(lambda: WordStore(read_pack(dest)[0]))
+            n = 100_000
+            start = time.perf_counter()
+            for _ in range(n):
+                store.random_word(rng=rng)
+            lookup = (time.perf_counter() - start) / n
+            print(f"{size:>10,} {text_time * 1000:>8.0f}ms {text_bytes / 2 ** 20:>8.1f} {compile_time:>7.2f}s "
+                  f"{pack_time * 1000:>8.2f}ms {pack_bytes / 1024:>8.1f} {os.path.getsize(dest) / 2 ** 20:>8.1f} "
+                  f"{lookup * 1e6:>6.2f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a Hangman word list into a memory-mapped pack")
+    parser.add_argument("source", nargs="?", default=WORDS_FILE)
+    parser.add_argument("-o", "--output", default=None, help="defaults to the source name with .pack")
+    parser.add_argument("--bench", action="store_true", help="compare text and pack startup on large lists")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark()
+        return
+    start = time.perf_counter()
+    rejected = []
+    dest = compile_pack(args.source, args.output, rejected)
+    sections = read_pack(dest)[0]
+    words = sum(len(section) for section in sections.values())
+    print(f"Wrote {dest}: {words:,} words in {len(sections)} length sections, "
+          f"{os.path.getsize(dest):,} bytes ({time.perf_counter() - start:.2f}s)")
+    if rejected:
+        print(f"Skipped {len(rejected):,} words with letters outside A-Z, e.g. {', '.join(rejected[:5])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import argparse
+import bisect
+import mmap
+import os
+import random
+import string
+import struct
+import time
+from array import array
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.txt")
+LETTERS = string.ascii_uppercase
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Compiled dictionary (see word_pack.py): header, one (length, count, offset) entry per
+# section, then each section's words back to back. Every word in a section has the same
+# length, so word i starts at offset + i * length. Words are A-Z only, one ASCII byte per
+# letter: the game, the solver and the letter masks all use a 26-letter alphabet.
+PACK_MAGIC = b"HWPK"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHHIQQ")
+PACK_SECTION = struct.Struct("<HIQ")
+
+# Bit positions set in each byte value, for turning bitsets back into word indices.
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+_cache = {}
+
+
+def _bits_to_indices(bits, size):
+    indices = []
+    for byte, value in enumerate(bits.to_bytes((size + 7) // 8, "little")):
+        if value:
+            base = byte << 3
+            indices.extend(base + bit for bit in _BYTE_BITS[value])
+    return indices
+
+
+class LengthIndex:
+    # Bitsets over one length section: bit i of at[p][c] is set when word i has letter c
+    # at position p, and bit i of has[c] when word i contains c anywhere. masks[i] is
+    # word i's 26-bit letter set.
+    __slots__ = ("size", "all", "at", "has", "masks")
+
+    def __init__(self, words):
+        size = len(words)
+        nbytes = (size + 7) // 8
+        length = len(words[0]) if size else 0
+        at = [[bytearray(nbytes) for _ in LETTERS] for _ in range(length)]
+        masks = array("I", bytes(4 * size))
+        for i, word in enumerate(words):
+            byte, bit = i >> 3, 1 << (i & 7)
+            mask = 0
+            for p, ch in enumerate(word):
+                c = ord(ch) - 65
+                at[p][c][byte] |= bit
+                mask |= 1 << c
+            masks[i] = mask
+        self.size = size
+        self.all = (1 << size) - 1
+        self.at = [[int.from_bytes(b, "little") for b in row] for row in at]
+        self.has = [0] * len(LETTERS)
+        for row in self.at:
+            for c, bits in enumerate(row):
+                self.has[c] |= bits
+        self.masks = masks
+
+    def match(self, pattern, wrong):
+        # pattern has a letter at revealed positions and None elsewhere. A revealed letter
+        # shows every occurrence, so it cannot also hide at an unrevealed position.
+        bits = self.all
+        revealed = {ch for ch in pattern if ch}
+        for p, ch in enumerate(pattern):
+            if ch:
+                bits &= self.at[p][ord(ch) - 65]
+            else:
+                for letter in revealed:
+                    bits &= ~self.at[p][ord(letter) - 65]
+        for letter in wrong:
+            bits &= ~self.has[ord(letter) - 65]
+        return bits
+
+
+class WordStore:
+    # Words grouped into one section per length. Sections only need len() and indexing,
+    # so they can be lists or lazy views over a compiled file. Letter indexes and
+    # difficulty buckets are built on first use, so loading stays a single pass.
+    def __init__(self, sections):
+        self.sections = {length: words for length, words in sorted(sections.items()) if len(words)}
+        self.lengths = list(self.sections)
+        self.starts = []
+        total = 0
+        for length in self.lengths:
+            self.starts.append(total)
+            total += len(self.sections[length])
+        self.size = total
+        self._indexes = {}
+        self._buckets = {}
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for words in self.sections.values():
+            yield from words
+
+    def word_at(self, i):
+        s = bisect.bisect_right(self.starts, i) - 1
+        return self.sections[self.lengths[s]][i - self.starts[s]]
+
+    def index(self, length):
+        index = self._indexes.get(length)
+        if index is None:
+            index = self._indexes[length] = LengthIndex(self.sections.get(length, ()))
+        return index
+
+    def difficulty_buckets(self, length):
+        # Words whose letters are common among words of their length get revealed quickly.
+        # Score each word by how many same-length words share each of its letters and split
+        # the section into terciles, easiest first.
+        buckets = self._buckets.get(length)
+        if buckets is None:
+            index = self.index(length)
+            counts = [bits.bit_count() for bits in index.has]
+            tables = [[sum(counts[base + b] for b in _BYTE_BITS[v] if base + b < 26) for v in range(256)]
+                      for base in (0, 8, 16, 24)]
+            t0, t1, t2, t3 = tables
+            scores = [t0[m & 255] + t1[m >> 8 & 255] + t2[m >> 16 & 255] + t3[m >> 24] for m in index.masks]
+            order = sorted(range(index.size), key=scores.__getitem__, reverse=True)
+            third = index.size / 3
+            buckets = self._buckets[length] = [order[round(level * third):round((level + 1) * third)]
+                                               for level in range(len(DIFFICULTIES))]
+        return buckets
+
+    def random_word(self, length=None, difficulty=None, rng=random):
+        if length is None:
+            # Every length's difficulty buckets are the same share of its section.
+            word = self.word_at(rng.randrange(self.size))
+            if difficulty is None:
+                return word
+            length = len(word)
+        words = self.sections.get(length)
+        if not words:
+            raise ValueError(f"no {length}-letter words")
+        if difficulty is None:
+            return words[rng.randrange(len(words))]
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+        bucket = self.difficulty_buckets(length)[DIFFICULTIES.index(difficulty)]
+        if not bucket:
+            raise ValueError(f"no {difficulty} {length}-letter words")
+        return words[bucket[rng.randrange(len(bucket))]]
+
+    def _query(self, pattern, wrong):
+        pattern = [ch if ch in LETTERS else None for ch in pattern.replace(" ", "").upper()]
+        return len(pattern), self.index(len(pattern)).match(pattern, {ch.upper() for ch in wrong})
+
+    def candidates(self, pattern, wrong=()):
+        # Words consistent with a display such as "_ P P _ E" and the letters guessed wrong.
+        length, bits = self._query(pattern, wrong)
+        words = self.sections.get(length, ())
+        return [words[i] for i in _bits_to_indices(bits, len(words))]
+
+    def count(self, pattern, wrong=()):
+        return self._query(pattern, wrong)[1].bit_count()
+
+
+class PackedSection:
+    # Read-only view of one length section of a memory-mapped pack.
+    __slots__ = ("data", "offset", "length", "count")
+
+    def __init__(self, data, offset, length, count):
+        self.data = data
+        self.offset = offset
+        self.length = length
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        start = self.offset + i * self.length
+        return self.data[start:start + self.length].decode("ascii")
+
+    def __iter__(self):
+        length = self.length
+        blob = self.data[self.offset:self.offset + self.count * length].decode("ascii")
+        for start in range(0, len(blob), length):
+            yield blob[start:start + length]
+
+
+def pack_path(path):
+    return os.path.splitext(path)[0] + ".pack"
+
+
+def read_pack(path):
+    # Returns (sections, source mtime_ns, source size). Only the header and section table
+    # are read; words are paged in from the mapping as they are used.
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count, _, mtime, size = PACK_HEADER.unpack_from(data)
+    if magic != PACK_MAGIC or version != PACK_VERSION:
+        raise ValueError(f"{path} is not a version {PACK_VERSION} word pack")
+    sections = {}
+    for i in range(count):
+        length, words, offset = PACK_SECTION.unpack_from(data, PACK_HEADER.size + i * PACK_SECTION.size)
+        sections[length] = PackedSection(data, offset, length, words)
+    return sections, mtime, size
+
+
+def read_sections(path, rejected=None):
+    # Words with anything besides A-Z (accents, hyphens, digits) are skipped, since letter
+    # masks and bitsets cover A-Z only; pass a list as `rejected` to collect them.
+    sections = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            word = line.strip().upper()
+            if word and word.isascii() and word.isalpha():
+                sections.setdefault(len(word), []).append(word)
+            elif word and rejected is not None:
+                rejected.append(word)
+    return sections
+
+
+def load(path=WORDS_FILE):
+    # One WordStore per file per process, rebuilt only when the file changes. A compiled
+    # pack next to a text dictionary is used instead while it matches the text's mtime and size.
+    path = os.path.abspath(path)
+    if not path.endswith(".pack"):
+        packed = pack_path(path)
+        if os.path.exists(packed):
+            stat = os.stat(path)
+            with open(packed, "rb") as file:
+                header = file.read(PACK_HEADER.size)
+            if len(header) == PACK_HEADER.size and \
+                    PACK_HEADER.unpack(header)[4:] == (stat.st_mtime_ns, stat.st_size):
+                path = packed
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    store = _cache.get(key)
+    if store is None:
+        sections = read_pack(path)[0] if path.endswith(".pack") else read_sections(path)
+        store = _cache[key] = WordStore(sections)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hangman word store benchmark")
+    parser.add_argument("--words", type=int, default=1_000_000, help="size of the synthetic dictionary")
+    parser.add_argument("--path", default=WORDS_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = load(args.path)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    load(args.path)
+    cached = time.perf_counter() - start
+    print(f"{args.path}: {len(store):,} words | first load {first * 1000:.1f} ms | cached {cached * 1e6:.1f} us")
+
+    rng = random.Random(1)
+    base = list(store)
+    words = [w + "".join(rng.choice(LETTERS) for _ in range(rng.randrange(4))) for w in
+             (base[rng.randrange(len(base))] for _ in range(args.words))]
+    sections = {}
+    start = time.perf_counter()
+    for word in words:
+        sections.setdefault(len(word), []).append(word)
+    big = WordStore(sections)
+    print(f"\nSynthetic dictionary: {len(big):,} words grouped in {time.perf_counter() - start:.2f}s")
+
+    n = 100_000
+    start = time.perf_counter()
+    for _ in range(n):
+        big.random_word(8, rng=rng)
+    print(f"random_word(8): {(time.perf_counter() - start) / n * 1e6:.2f} us")
+    start = time.perf_counter()
+    big.index(8)
+    print(f"8-letter index ({len(big.sections[8]):,} words) built in {time.perf_counter() - start:.2f}s")
+    for pattern, wrong in (("________", ""), ("_A______", "ST"), ("_A__E___", "STRIO")):
+        start = time.perf_counter()
+        count = big.count(pattern, wrong)
+        counted = time.perf_counter() - start
+        start = time.perf_counter()
+        found = big.candidates(pattern, wrong)
+        listed = time.perf_counter() - start
+        print(f"{pattern} wrong={wrong or '-':<6} {count:>8,} matches | count {counted * 1000:.2f} ms | "
+              f"list {listed * 1000:.1f} ms" + (f" | e.g. {found[0]}" if found else ""))
+    start = time.perf_counter()
+    big.difficulty_buckets(8)
+    print(f"8-letter difficulty buckets built in {time.perf_counter() - start:.2f}s; "
+          f"hard 8-letter example: {big.random_word(8, 'hard', rng)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import random
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from HeadsOrTails import MIN_BET, STARTING_BALANCE, STARTING_WIN_CHANCE, next_win_chance
+
+# The game is a Markov chain over (balance, win_chance). Win chances are rounded
+# so that float noise from repeated steps cannot split one state into two.
+CHANCE_DIGITS = 10
+
+
+def fixed_bet(amount):
+    def policy(balance, win_chance):
+        return min(max(amount, MIN_BET), balance)
+    return policy
+
+
+def fraction_bet(fraction):
+    def policy(balance, win_chance):
+        return min(max(int(balance * fraction), MIN_BET), balance)
+    return policy
+
+
+def all_in(balance, win_chance):
+    return balance
+
+
+@lru_cache(maxsize=None)
+def _step(win_chance, won):
+    return round(next_win_chance(win_chance, won), CHANCE_DIGITS)
+
+
+def solve(rounds, policy, balance=STARTING_BALANCE, win_chance=STARTING_WIN_CHANCE, reset=False,
+          tolerance=1e-15):
+    # Exact distribution after each round by propagating probability over reachable states.
+    # With reset=True a ruined player restarts from the starting state, as heads_or_tails() does.
+    # States whose probability falls below tolerance are dropped and their mass reported.
+    start = (balance, round(win_chance, CHANCE_DIGITS))
+    states = {start: 1.0}
+    ruin_by_round = []
+    ruined = 0.0
+    expected_resets = 0.0
+    dropped = 0.0
+    bets = {}
+    for _ in range(rounds):
+        nxt = defaultdict(float)
+        ruined_now = 0.0
+        for (bal, chance), p in states.items():
+            bet = bets.get((bal, chance))
+            if bet is None:
+                bet = bets[bal, chance] = policy(bal, chance)
+            if chance > 0.0:
+                nxt[bal + bet, _step(chance, True)] += p * chance
+            if chance < 1.0:
+                lost = bal - bet
+                if lost <= 0:
+                    ruined_now += p * (1.0 - chance)
+                else:
+                    nxt[lost, _step(chance, False)] += p * (1.0 - chance)
+        if reset:
+            expected_resets += ruined_now
+            if ruined_now:
+                nxt[start] += ruined_now
+        else:
+            ruined += ruined_now
+        ruin_by_round.append(ruined if not reset else expected_resets)
+        states = {}
+        for state, p in nxt.items():
+            if p < tolerance:
+                dropped += p
+            else:
+                states[state] = p
+
+    balances = defaultdict(float)
+    for (bal, _), p in states.items():
+        balances[bal] += p
+    expected = sum(bal * p for bal, p in balances.items())
+    return {
+        "balances": dict(sorted(balances.items())),
+        "ruin": ruined,
+        "ruin_by_round": ruin_by_round,
+        "expected_resets": expected_resets,
+        "expected_balance": expected,
+        # Money the player is down on average, counting every bankroll lost to a reset.
+        "expected_cost": balance + expected_resets * balance - expected,
+        "states": len(states),
+        "dropped": dropped,
+    }
+
+
+def monte_carlo(rounds, policy, runs, balance=STARTING_BALANCE, win_chance=STARTING_WIN_CHANCE,
+                reset=False, seed=None):
+    rng = random.Random(seed)
+    ruined = 0
+    resets = 0
+    total = 0
+    for _ in range(runs):
+        bal, chance = balance, win_chance
+        for _ in range(rounds):
+            bet = policy(bal, chance)
+            won = rng.random() < chance
+            bal += bet if won else -bet
+            chance = next_win_chance(chance, won)
+            if bal <= 0:
+                if not reset:
+                    ruined += 1
+                    break
+                resets += 1
+                bal, chance = balance, win_chance
+        total += bal
+    mean = total / runs
+    return {"ruin": ruined / runs, "expected_resets": resets / runs, "expected_balance": mean,
+            "expected_cost": balance + resets / runs * balance - mean}
+
+
+def parse_policy(text):
+    kind, _, value = text.partition(":")
+    if kind == "fixed":
+        return fixed_bet(int(value or MIN_BET))
+    if kind == "fraction":
+        return fraction_bet(float(value or 0.1))
+    if kind == "all-in":
+        return all_in
+    raise argparse.ArgumentTypeError(f"unknown policy {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact bankroll and ruin distribution for Heads or Tails")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--policy", default="fixed:1", help="fixed:<amount>, fraction:<f> or all-in")
+    parser.add_argument("--reset", action="store_true", help="restart from the starting balance on ruin")
+    parser.add_argument("--mc", type=int, default=0, metavar="RUNS", help="Monte Carlo cross-check runs")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    policy = parse_policy(args.policy)
+
+    start = time.perf_counter()
+    result = solve(args.rounds, policy, reset=args.reset)
+    elapsed = time.perf_counter() - start
+    print(f"Policy {args.policy}, {args.rounds} rounds ({result['states']} live states, {elapsed:.2f}s, "
+          f"{result['dropped']:.1e} probability below tolerance dropped)")
+    if args.reset:
+        print(f"Expected resets: {result['expected_resets']:.4f}")
+    else:
+        print(f"Ruin probability: {result['ruin']:.6f}")
+    print(f"Expected final balance: ${result['expected_balance']:.2f}")
+    print(f"Expected cost to player: ${result['expected_cost']:.2f}")
+
+    balances = result["balances"]
+    if balances:
+        total, cumulative, marks = sum(balances.values()), 0.0, {}
+        for bal, p in balances.items():
+            cumulative += p
+            for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+                if q not in marks and cumulative >= q * total:
+                    marks[q] = bal
+        print("Surviving balance quantiles: " + " | ".join(f"p{int(q * 100)}: ${bal}" for q, bal in marks.items()))
+
+    if args.mc:
+        mc = monte_carlo(args.rounds, policy, args.mc, reset=args.reset, seed=args.seed)
+        print(f"\nMonte Carlo ({args.mc} runs): ruin {mc['ruin']:.6f} | resets {mc['expected_resets']:.4f} | "
+              f"final ${mc['expected_balance']:.2f} | cost ${mc['expected_cost']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import heapq
+from collections import deque
+
+
+class Inventory:
+    # Slot container for the backpack and chest. Slots keep their arrival order, but are
+    # stored per item type with running totals, so capacity checks, totals and partial
+    # removals never rescan every slot.
+    __slots__ = ("_slots", "_totals", "_count", "_seq")
+
+    def __init__(self, items=()):
+        self._slots = {}
+        self._totals = {}
+        self._count = 0
+        self._seq = 0
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        # (item_type, amount) pairs in slot order.
+        streams = [self._tagged(typ, queue) for typ, queue in self._slots.items()]
+        for _, typ, amount in heapq.merge(*streams):
+            yield typ, amount
+
+    @staticmethod
+    def _tagged(typ, queue):
+        for seq, amount in queue:
+            yield seq, typ, amount
+
+    def append(self, item):
+        typ, amount = item
+        queue = self._slots.get(typ)
+        if queue is None:
+            queue = self._slots[typ] = deque()
+            self._totals[typ] = 0
+        queue.append([self._seq, amount])
+        self._seq += 1
+        self._totals[typ] += amount
+        self._count += 1
+
+    def popleft(self):
+        typ = min(self._slots, key=lambda t: self._slots[t][0][0])
+        _, amount = self._slots[typ].popleft()
+        self._take(typ, amount, 1)
+        return typ, amount
+
+    def move_to(self, other, limit):
+        # Move up to limit slots, oldest first. Returns how many slots moved.
+        moved = 0
+        while self._count and moved < limit:
+            other.append(self.popleft())
+            moved += 1
+        return moved
+
+    def total(self, typ):
+        return self._totals.get(typ, 0)
+
+    def totals(self):
+        # Per-type amounts, ordered by each type's oldest slot.
+        order = sorted(self._slots, key=lambda t: self._slots[t][0][0])
+        return {typ: self._totals[typ] for typ in order}
+
+    def remove(self, typ, amount):
+        # Take amount from the oldest slots of typ; emptied slots disappear, a partly
+        # used slot keeps its place. Returns the amount actually removed.
+        queue = self._slots.get(typ)
+        removed = 0
+        emptied = 0
+        while queue and removed < amount:
+            slot = queue[0]
+            take = min(slot[1], amount - removed)
+            slot[1] -= take
+            removed += take
+            if not slot[1]:
+                queue.popleft()
+                emptied += 1
+        if queue is not None:
+            self._take(typ, removed, emptied)
+        return removed
+
+    def _take(self, typ, amount, slots):
+        self._totals[typ] -= amount
+        self._count -= slots
+        if not self._slots[typ]:
+            del self._slots[typ]
+            del self._totals[typ]
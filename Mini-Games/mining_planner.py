@@ -0,0 +1,259 @@
+import argparse
+import heapq
+import importlib
+import itertools
+import math
+import time
+
+cave = importlib.import_module("cave-mining")
+
+FUEL_ITEM = "Lava Bucket"
+
+# Expected-yield model of Player: every ore explore yields the mean of
+# int(randint(5, 15) * efficiency) kg, and Coal turns up on every
+# round(1 / COAL_CHANCE)-th explore (wasted if Coal is already held, since
+# Player.items is a set). Ore slots of one type all hold the same expected kg,
+# and ore types are mined in pickaxe order, so the backpack's FIFO order is
+# simply type order. Plans are therefore sequences of menu actions whose length
+# is the expected action count under average luck.
+
+
+class Model:
+    def __init__(self, pickaxe_upgrades=None, backpack_upgrades=None, chest_upgrades=None, shop_items=None):
+        self.pickaxes = pickaxe_upgrades or cave.PICKAXE_UPGRADES
+        self.backpacks = backpack_upgrades or cave.BACKPACK_UPGRADES
+        self.chests = chest_upgrades or cave.CHEST_UPGRADES
+        self.shop = dict(shop_items or cave.SHOP_ITEMS)
+        self.items = list(self.shop)
+        self.coal_every = round(1 / cave.COAL_CHANCE)
+        self.ores = cave.ORE_TYPES
+        self.yields = [sum(int(r * p["efficiency"]) for r in range(5, 16)) / 11 for p in self.pickaxes]
+        self.max_income = max(self.yields) * 10
+        # kg per slot of each ore type: the yield of the pickaxe level that mines it.
+        self.slot_kg = [0.0] * len(self.ores)
+        for level in range(len(self.pickaxes) - 1, -1, -1):
+            self.slot_kg[min(level, len(self.ores) - 1)] = self.yields[level]
+        self.all_items = (1 << len(self.items)) - 1
+        self.fuel_bit = 1 << self.items.index(FUEL_ITEM) if FUEL_ITEM in self.shop else 0
+
+    def ore_index(self, pickaxe_level):
+        return min(pickaxe_level, len(self.ores) - 1)
+
+    def start(self):
+        empty = (0,) * len(self.ores)
+        # pickaxe, backpack, chest, money, bought mask, lava, coal, explores since coal,
+        # backpack slots per ore, chest slots per ore, ingots per ore
+        return (0, 0, 0, 0.0, 0, False, False, 0, empty, empty, empty)
+
+    def actions(self, state, goal):
+        pick, bp_lvl, chest_lvl, money, bought, lava, coal, since, bp, chest, ingots = state
+
+        since += 1
+        nbp = bp
+        ncoal = coal
+        nmoney = money
+        if since == self.coal_every:
+            since = 0
+            ncoal = True
+        else:
+            ore = self.ore_index(pick)
+            nmoney = round(money + self.yields[pick] * 10, 2)
+            if sum(bp) < self.backpacks[bp_lvl]["capacity"]:
+                nbp = _bump(bp, ore, 1)
+        yield "explore", (pick, bp_lvl, chest_lvl, nmoney, bought, lava, ncoal, since, nbp, chest, ingots)
+        since = state[7]
+
+        # A deposit only matters to a later smelt, and moving it to after the fuel turns up
+        # moves the same oldest slots, so plans only deposit while holding fuel.
+        room = self.chests[chest_lvl]["capacity"] - sum(chest)
+        if (coal or lava) and room > 0 and sum(bp):
+            nbp, nchest = list(bp), list(chest)
+            for ore in range(len(bp)):
+                moved = min(room, nbp[ore])
+                nbp[ore] -= moved
+                nchest[ore] += moved
+                room -= moved
+            yield "deposit", (pick, bp_lvl, chest_lvl, money, bought, lava, coal, since,
+                              tuple(nbp), tuple(nchest), ingots)
+
+        if coal or lava:
+            for ore, slots in enumerate(chest):
+                if slots:
+                    yield f"smelt {self.ores[ore]}", (
+                        pick, bp_lvl, chest_lvl, money, bought, lava if coal else False, False, since,
+                        bp, _bump(chest, ore, -slots), _bump(ingots, ore, slots * self.slot_kg[ore]))
+
+        if pick + 1 < len(self.pickaxes):
+            upgrade = self.pickaxes[pick + 1]
+            ore = self.ores.index(upgrade["name"])
+            if ingots[ore] >= upgrade["cost"]:
+                yield "upgrade pickaxe", (pick + 1, bp_lvl, chest_lvl, money, bought, lava, coal, since,
+                                          bp, chest, _bump(ingots, ore, -upgrade["cost"]))
+        # Money comes from every ore explore whatever the backpack holds, so storage
+        # upgrades only delay a shopping plan.
+        if goal != "shop":
+            if bp_lvl + 1 < len(self.backpacks) and money >= self.backpacks[bp_lvl + 1]["cost"]:
+                yield "upgrade backpack", (pick, bp_lvl + 1, chest_lvl, round(money - self.backpacks[bp_lvl + 1]["cost"], 2),
+                                           bought, lava, coal, since, bp, chest, ingots)
+            if chest_lvl + 1 < len(self.chests) and money >= self.chests[chest_lvl + 1]["cost"]:
+                yield "upgrade chest", (pick, bp_lvl, chest_lvl + 1, round(money - self.chests[chest_lvl + 1]["cost"], 2),
+                                        bought, lava, coal, since, bp, chest, ingots)
+
+        # Only fuel changes what a player can do; every other purchase can wait until the
+        # end without lengthening a plan, so those are only bought once all are affordable.
+        remaining = self.remaining_cost(bought)
+        for bit, item in enumerate(self.items):
+            mask = 1 << bit
+            cost = self.shop[item]
+            if money < cost:
+                continue
+            if mask == self.fuel_bit:
+                if lava:
+                    continue
+            elif bought & mask or goal != "shop" or money < remaining:
+                continue
+            yield f"buy {item}", (pick, bp_lvl, chest_lvl, round(money - cost, 2), bought | mask,
+                                  lava or mask == self.fuel_bit, coal, since, bp, chest, ingots)
+
+    def canonical(self, state, goal):
+        # With the last pickaxe and a shopping goal only money, purchases and a held Lava
+        # Bucket still matter, so states that differ in ore, coal or storage are merged.
+        if goal == "shop" and state[0] == len(self.pickaxes) - 1:
+            empty = (0,) * len(self.ores)
+            return (state[0], 0, 0, state[3], state[4], state[5], False, 0, empty, empty, empty)
+        return state
+
+    def remaining_cost(self, bought):
+        return sum(self.shop[item] for bit, item in enumerate(self.items) if not bought & (1 << bit))
+
+    def is_goal(self, state, goal):
+        if goal == "diamond":
+            return state[0] == len(self.pickaxes) - 1
+        return state[4] == self.all_items
+
+    def heuristic(self, state, goal):
+        if goal == "diamond":
+            return sum(self.progress_bound(state, len(self.pickaxes) - 1))
+        # Shopping ends at some pickaxe level; reaching it takes at least the progress
+        # bound, whose explores pay at most the previous level's rate, and the rest is
+        # earned at that level's rate. Each missing item is one more action.
+        money, bought = state[3], state[4]
+        short = max(0.0, self.remaining_cost(bought) - money)
+        best = math.inf
+        for level in range(state[0], len(self.pickaxes)):
+            actions, explores = self.progress_bound(state, level)
+            if level > state[0]:
+                short_after = max(0.0, short - explores * self.yields[level - 1] * 10)
+            else:
+                short_after = short
+            best = min(best, actions + explores + math.ceil(short_after / (self.yields[level] * 10) - 1e-9))
+        return bin(self.all_items & ~bought).count("1") + best
+
+    def progress_bound(self, state, target):
+        # Lower bound on (non-explore actions, explores) to reach pickaxe level target.
+        pick, bp_lvl, chest_lvl, money, bought, lava, coal, since, bp, chest, ingots = state
+        if pick >= target:
+            return 0, 0
+        # Non-explore actions still missing for the next upgrade, plus deposit, smelt and
+        # upgrade for every later one.
+        upgrade = self.pickaxes[pick + 1]
+        ore = self.ores.index(upgrade["name"])
+        need = upgrade["cost"] - ingots[ore]
+        actions = 1
+        ore_explores = 0
+        smelts = 0
+        if need > 0:
+            actions += 1
+            smelts += 1
+            in_chest = chest[ore] * self.slot_kg[ore]
+            if in_chest < need:
+                actions += 1
+                short = need - in_chest - bp[ore] * self.slot_kg[ore]
+                if short > 0:
+                    ore_explores += math.ceil(short / self.yields[pick] - 1e-9)
+        for level in range(pick + 1, target):
+            actions += 3
+            smelts += 1
+            ore_explores += math.ceil(self.pickaxes[level + 1]["cost"] / self.yields[level] - 1e-9)
+
+        # Every smelt burns Coal or a Lava Bucket. Coal explores yield no ore, and any plan
+        # that buys a Lava Bucket first has to earn its price.
+        coals = max(0, smelts - coal - lava)
+        explores = ore_explores + coals
+        if coals:
+            coal_explores = (self.coal_every - since) + (coals - 1) * self.coal_every
+            explores = max(explores, coal_explores)
+            if self.fuel_bit:
+                lava_explores = math.ceil(max(0.0, self.shop[FUEL_ITEM] - money) / self.max_income - 1e-9)
+                explores = min(explores, max(ore_explores, lava_explores))
+        return actions, explores
+
+
+def _bump(values, index, delta):
+    return values[:index] + (values[index] + delta,) + values[index + 1:]
+
+
+def plan(goal="diamond", model=None, max_expansions=5_000_000):
+    model = model or Model()
+    start = model.start()
+    counter = itertools.count()
+    frontier = [(model.heuristic(start, goal), 0, next(counter), start)]
+    best_g = {start: 0}
+    parent = {start: None}
+    expansions = 0
+    while frontier:
+        _, neg_g, _, state = heapq.heappop(frontier)
+        g = -neg_g
+        if g > best_g.get(state, math.inf):
+            continue
+        if model.is_goal(state, goal):
+            return _path(parent, state), expansions, len(best_g)
+        expansions += 1
+        if expansions > max_expansions:
+            break
+        for action, child in model.actions(state, goal):
+            child = model.canonical(child, goal)
+            if g + 1 < best_g.get(child, math.inf):
+                best_g[child] = g + 1
+                parent[child] = (state, action)
+                # Prefer deeper nodes among equal f so long explore runs are not re-expanded.
+                heapq.heappush(frontier, (g + 1 + model.heuristic(child, goal), -(g + 1), next(counter), child))
+    return None, expansions, len(best_g)
+
+
+def _path(parent, state):
+    actions = []
+    while parent[state] is not None:
+        state, action = parent[state]
+        actions.append(action)
+    return actions[::-1]
+
+
+def summarize(actions):
+    runs = []
+    for action, group in itertools.groupby(actions):
+        n = len(list(group))
+        runs.append(f"{action} x{n}" if n > 1 else action)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cave-mining progression planner")
+    parser.add_argument("--goal", choices=("diamond", "shop"), default="diamond",
+                        help="reach a Diamond pickaxe, or buy every shop item")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    actions, expansions, states = plan(args.goal)
+    elapsed = time.perf_counter() - start
+    if actions is None:
+        print(f"No plan found ({expansions} expansions, {states} states)")
+        return
+    print(f"Goal '{args.goal}': {len(actions)} actions (expected-yield model)")
+    for step in summarize(actions):
+        print(f"  {step}")
+    print(f"Searched {expansions} states ({states} distinct) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
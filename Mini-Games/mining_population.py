@@ -0,0 +1,409 @@
+import argparse
+import importlib
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+cave = importlib.import_module("cave-mining")
+
+LEVELS = len(cave.PICKAXE_UPGRADES)
+ORES = len(cave.ORE_TYPES)
+EFFICIENCY = np.array([p["efficiency"] for p in cave.PICKAXE_UPGRADES])
+# Ore mined with each pickaxe, and the ingot type and amount the next upgrade needs.
+MINED_ORE = np.array([min(level, ORES - 1) for level in range(LEVELS)])
+UPGRADE_ORE = np.array([cave.ORE_TYPES.index(cave.PICKAXE_UPGRADES[level + 1]["name"]) if level + 1 < LEVELS else 0
+                        for level in range(LEVELS)])
+UPGRADE_COST = np.array([cave.PICKAXE_UPGRADES[level + 1]["cost"] if level + 1 < LEVELS else 0
+                         for level in range(LEVELS)])
+BACKPACK_CAPACITY = np.array([b["capacity"] for b in cave.BACKPACK_UPGRADES])
+BACKPACK_COST = np.array([b["cost"] for b in cave.BACKPACK_UPGRADES] + [0])
+CHEST_CAPACITY = np.array([c["capacity"] for c in cave.CHEST_UPGRADES])
+CHEST_COST = np.array([c["cost"] for c in cave.CHEST_UPGRADES] + [0])
+ITEMS = list(cave.SHOP_ITEMS)
+ITEM_COST = np.array([cave.SHOP_ITEMS[item] for item in ITEMS])
+LAVA_BIT = 1 << ITEMS.index("Lava Bucket")
+FUEL_COST = cave.SHOP_ITEMS["Lava Bucket"]
+MAX_BACKPACK = int(BACKPACK_CAPACITY.max())
+
+POLICIES = ("greedy", "upgrader")
+MONEY_BIN = 1000
+AGENTS_PER_TASK = 50_000
+
+
+# Both engines run the same scripted bot, checked in this order every action:
+#   1. upgrade the pickaxe once the ingots are there
+#   2. smelt the next upgrade's ore once chest + ingots cover it (or the oldest ore if
+#      the chest is full), whenever Coal or a Lava Bucket is held
+#   3. deposit while holding fuel, or when the backpack is full
+#   4. buy a Lava Bucket instead of waiting for Coal, if enough ore is already mined
+#   5. "upgrader" only: buy backpack and chest upgrades as soon as they are affordable
+#   6. with a Diamond pickaxe, buy the cheapest missing shop item
+#   7. otherwise explore
+
+
+class Population:
+    # Struct-of-arrays state for n players. The backpack keeps every slot's kg in a ring
+    # buffer so partial deposits move exactly the oldest slots, as Inventory.move_to does;
+    # ore arrives in pickaxe order, so both containers hold their ore types in index order.
+    __slots__ = ("n", "money", "pickaxe", "backpack_level", "chest_level", "coal", "owned",
+                 "slots", "head", "count", "backpack_slots", "backpack_kg", "chest_slots", "chest_kg",
+                 "ingots", "reached")
+
+    def __init__(self, n):
+        self.n = n
+        self.money = np.zeros(n, dtype=np.int64)
+        self.pickaxe = np.zeros(n, dtype=np.int8)
+        self.backpack_level = np.zeros(n, dtype=np.int8)
+        self.chest_level = np.zeros(n, dtype=np.int8)
+        self.coal = np.zeros(n, dtype=bool)
+        self.owned = np.zeros(n, dtype=np.uint8)
+        self.slots = np.zeros((n, MAX_BACKPACK), dtype=np.uint8)
+        self.head = np.zeros(n, dtype=np.int16)
+        self.count = np.zeros(n, dtype=np.int16)
+        self.backpack_slots = np.zeros((n, ORES), dtype=np.int16)
+        self.backpack_kg = np.zeros((n, ORES), dtype=np.int32)
+        self.chest_slots = np.zeros((n, ORES), dtype=np.int16)
+        self.chest_kg = np.zeros((n, ORES), dtype=np.int32)
+        self.ingots = np.zeros((n, ORES), dtype=np.int32)
+        # Action number at which each pickaxe level was reached, -1 if not yet.
+        self.reached = np.full((n, LEVELS), -1, dtype=np.int32)
+        self.reached[:, 0] = 0
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.__slots__ if name != "n")
+
+    def step(self, rng, action, policy):
+        n = self.n
+        rows = np.arange(n)
+        pick = self.pickaxe.astype(np.intp)
+        free = np.ones(n, dtype=bool)
+
+        progressing = pick + 1 < LEVELS
+        need = UPGRADE_ORE[pick]
+        cost = UPGRADE_COST[pick]
+        ingots = self.ingots[rows, need]
+        in_chest = self.chest_kg[rows, need]
+        fuel = self.coal | (self.owned & LAVA_BIT > 0)
+        room = CHEST_CAPACITY[self.chest_level] - self.chest_slots.sum(axis=1)
+
+        upgrade = progressing & (ingots >= cost)
+        free &= ~upgrade
+        smelt_next = free & progressing & fuel & (in_chest > 0) & (ingots + in_chest >= cost)
+        smelt_oldest = free & ~smelt_next & progressing & fuel & (room <= 0)
+        smelt = smelt_next | smelt_oldest
+        free &= ~smelt
+        capacity = BACKPACK_CAPACITY[self.backpack_level]
+        deposit = free & progressing & (self.count > 0) & (room > 0) & (fuel | (self.count >= capacity))
+        free &= ~deposit
+        mined = ingots + in_chest + self.backpack_kg[rows, need]
+        lava = free & progressing & ~fuel & (self.money >= FUEL_COST) & (mined >= cost)
+        free &= ~lava
+        buy_backpack = np.zeros(n, dtype=bool)
+        buy_chest = np.zeros(n, dtype=bool)
+        if policy == "upgrader":
+            buy_backpack = free & (self.backpack_level + 1 < len(BACKPACK_CAPACITY)) & \
+                (self.money >= BACKPACK_COST[self.backpack_level + 1])
+            free &= ~buy_backpack
+            buy_chest = free & (self.chest_level + 1 < len(CHEST_CAPACITY)) & \
+                (self.money >= CHEST_COST[self.chest_level + 1])
+            free &= ~buy_chest
+        missing = (self.owned[:, None] >> np.arange(len(ITEMS))) & 1 == 0
+        prices = np.where(missing, ITEM_COST, np.iinfo(np.int64).max)
+        cheapest = prices.argmin(axis=1)
+        shop = free & ~progressing & (self.money >= prices[rows, cheapest])
+        free &= ~shop
+
+        self._explore(rng, np.flatnonzero(free))
+        self._deposit(np.flatnonzero(deposit), room)
+        oldest = np.argmax(self.chest_kg > 0, axis=1)
+        self._smelt(np.flatnonzero(smelt), np.where(smelt_next, need, oldest))
+        idx = np.flatnonzero(upgrade)
+        self.ingots[idx, need[idx]] -= cost[idx]
+        self.pickaxe[idx] += 1
+        self.reached[idx, self.pickaxe[idx]] = action + 1
+        idx = np.flatnonzero(lava)
+        self.money[idx] -= FUEL_COST
+        self.owned[idx] |= LAVA_BIT
+        idx = np.flatnonzero(buy_backpack)
+        self.money[idx] -= BACKPACK_COST[self.backpack_level[idx] + 1]
+        self.backpack_level[idx] += 1
+        idx = np.flatnonzero(buy_chest)
+        self.money[idx] -= CHEST_COST[self.chest_level[idx] + 1]
+        self.chest_level[idx] += 1
+        idx = np.flatnonzero(shop)
+        self.money[idx] -= ITEM_COST[cheapest[idx]]
+        self.owned[idx] |= (1 << cheapest[idx]).astype(np.uint8)
+
+    def _explore(self, rng, idx):
+        found_coal = rng.random(len(idx)) < cave.COAL_CHANCE
+        self.coal[idx[found_coal]] = True
+        idx = idx[~found_coal]
+        pick = self.pickaxe[idx]
+        amount = (rng.integers(5, 16, len(idx)) * EFFICIENCY[pick]).astype(np.int32)
+        self.money[idx] += amount * 10
+        room = self.count[idx] < BACKPACK_CAPACITY[self.backpack_level[idx]]
+        idx, amount, ore = idx[room], amount[room], MINED_ORE[pick[room]]
+        self.slots[idx, (self.head[idx] + self.count[idx]) % MAX_BACKPACK] = amount
+        self.count[idx] += 1
+        self.backpack_slots[idx, ore] += 1
+        self.backpack_kg[idx, ore] += amount
+
+    def _deposit(self, idx, room):
+        if not len(idx):
+            return
+        moved = np.minimum(room[idx], self.count[idx]).astype(np.intp)
+        width = np.arange(moved.max())
+        cols = (self.head[idx, None] + width) % MAX_BACKPACK
+        taken = np.where(width < moved[:, None], self.slots[idx[:, None], cols], 0)
+        prefix = np.zeros((len(idx), len(width) + 1), dtype=np.int32)
+        np.cumsum(taken, axis=1, out=prefix[:, 1:])
+        start = np.zeros(len(idx), dtype=np.intp)
+        for ore in range(ORES):
+            end = start + self.backpack_slots[idx, ore]
+            lo, hi = np.minimum(moved, start), np.minimum(moved, end)
+            kg = prefix[np.arange(len(idx)), hi] - prefix[np.arange(len(idx)), lo]
+            self.backpack_slots[idx, ore] -= (hi - lo).astype(np.int16)
+            self.backpack_kg[idx, ore] -= kg
+            self.chest_slots[idx, ore] += (hi - lo).astype(np.int16)
+            self.chest_kg[idx, ore] += kg
+            start = end
+        self.head[idx] = (self.head[idx] + moved) % MAX_BACKPACK
+        self.count[idx] -= moved.astype(np.int16)
+
+    def _smelt(self, idx, ores):
+        ore = ores[idx]
+        self.ingots[idx, ore] += self.chest_kg[idx, ore]
+        self.chest_kg[idx, ore] = 0
+        self.chest_slots[idx, ore] = 0
+        coal = self.coal[idx]
+        self.coal[idx[coal]] = False
+        self.owned[idx[~coal]] &= np.uint8(~LAVA_BIT & 0xFF)
+
+
+class Bot:
+    # Drives a real cave-mining Player: each turn picks a menu method and queues the
+    # answers its prompts will ask for.
+    __slots__ = ("player", "policy", "answers")
+
+    def __init__(self, policy="greedy"):
+        self.answers = deque()
+        self.player = cave.Player(ask=self._answer, say=_quiet)
+        self.policy = policy
+
+    def _answer(self, prompt):
+        return self.answers.popleft()
+
+    def turn(self):
+        p = self.player
+        answers = self.answers
+        upgrade = p.pickaxe_level + 1 < LEVELS
+        if upgrade:
+            need = cave.ORE_TYPES[UPGRADE_ORE[p.pickaxe_level]]
+            cost = UPGRADE_COST[p.pickaxe_level]
+            ingots = p.ingots[need]
+            in_chest = p.chest.total(f"{need} Ore")
+            fuel = "Coal" in p.items or "Lava Bucket" in p.items
+            room = p.chest_capacity - len(p.chest)
+            if ingots >= cost:
+                return p.upgrade_pickaxe()
+            if fuel and (in_chest and ingots + in_chest >= cost or room <= 0):
+                totals = p.chest.totals()
+                ore = f"{need} Ore" if in_chest and ingots + in_chest >= cost else next(iter(totals))
+                answers.append(str(list(totals).index(ore) + 1))
+                answers.append(str(totals[ore]))
+                return p.smelt()
+            if p.backpack and room > 0 and (fuel or len(p.backpack) >= p.backpack_capacity):
+                return p.deposit_backpack()
+            if not fuel and p.money >= FUEL_COST and ingots + in_chest + p.backpack.total(f"{need} Ore") >= cost:
+                answers.append(str(ITEMS.index("Lava Bucket") + 1))
+                return p.shop()
+        if self.policy == "upgrader":
+            level = p.backpack_level + 1
+            if level < len(BACKPACK_CAPACITY) and p.money >= BACKPACK_COST[level]:
+                return p.upgrade_backpack()
+            level = p.chest_level + 1
+            if level < len(CHEST_CAPACITY) and p.money >= CHEST_COST[level]:
+                return p.upgrade_chest()
+        if not upgrade:
+            missing = [i for i, item in enumerate(ITEMS) if item not in p.items and item not in p.suits]
+            if missing:
+                cheapest = min(missing, key=lambda i: ITEM_COST[i])
+                if p.money >= ITEM_COST[cheapest]:
+                    answers.append(str(cheapest + 1))
+                    return p.shop()
+        answers.append("1")
+        return p.explore()
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+def new_stats(actions, every):
+    checkpoints = actions // every
+    return {
+        "every": every,
+        "agents": 0,
+        "money": np.zeros(checkpoints),
+        "tiers": np.zeros((checkpoints, LEVELS), dtype=np.int64),
+        "money_hist": np.zeros((checkpoints, actions * 450 // MONEY_BIN + 1), dtype=np.int64),
+        # Column actions + 1 counts players who never reached the level.
+        "reached": np.zeros((LEVELS, actions + 2), dtype=np.int64),
+    }
+
+
+def merge(total, part):
+    total["agents"] += part["agents"]
+    for key in ("money", "tiers", "money_hist", "reached"):
+        total[key] += part[key]
+    return total
+
+
+def _checkpoint(stats, index, money, pickaxe):
+    stats["money"][index] += money.sum()
+    stats["tiers"][index] += np.bincount(pickaxe, minlength=LEVELS)
+    hist = stats["money_hist"][index]
+    hist += np.bincount(np.minimum(money // MONEY_BIN, len(hist) - 1), minlength=len(hist))
+
+
+def _reached(stats, reached, actions):
+    never = actions + 1
+    for level in range(LEVELS):
+        stats["reached"][level] += np.bincount(np.where(reached[:, level] < 0, never, reached[:, level]),
+                                               minlength=never + 1)
+
+
+def run_population(n, actions, every, policy, seed):
+    rng = np.random.default_rng(seed)
+    pop = Population(n)
+    stats = new_stats(actions, every)
+    stats["agents"] = n
+    for action in range(actions):
+        pop.step(rng, action, policy)
+        if (action + 1) % every == 0:
+            _checkpoint(stats, (action + 1) // every - 1, pop.money, pop.pickaxe.astype(np.intp))
+    _reached(stats, pop.reached, actions)
+    return stats
+
+
+def run_players(n, actions, every, policy, seed):
+    # Reference engine: real Player objects. cave-mining draws from the random module,
+    # so each worker seeds its own copy.
+    random.seed(seed)
+    bots = [Bot(policy) for _ in range(n)]
+    reached = np.full((n, LEVELS), -1, dtype=np.int32)
+    reached[:, 0] = 0
+    stats = new_stats(actions, every)
+    stats["agents"] = n
+    for action in range(actions):
+        for i, bot in enumerate(bots):
+            level = bot.player.pickaxe_level
+            bot.turn()
+            if bot.player.pickaxe_level != level:
+                reached[i, bot.player.pickaxe_level] = action + 1
+        if (action + 1) % every == 0:
+            _checkpoint(stats, (action + 1) // every - 1,
+                        np.array([bot.player.money for bot in bots], dtype=np.int64),
+                        np.array([bot.player.pickaxe_level for bot in bots], dtype=np.intp))
+    _reached(stats, reached, actions)
+    return stats
+
+
+ENGINES = {"arrays": run_population, "players": run_players}
+
+
+def simulate(agents, actions=2000, every=100, policy="greedy", engine="arrays", workers=None, seed=None,
+             per_task=AGENTS_PER_TASK):
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    tasks = []
+    remaining = agents
+    while remaining > 0:
+        tasks.append(min(per_task, remaining))
+        remaining -= tasks[-1]
+    stats = new_stats(actions, every)
+    run = ENGINES[engine]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, n, actions, every, policy, seed ^ (i << 32)) for i, n in enumerate(tasks)]
+        for future in futures:
+            merge(stats, future.result())
+    return stats
+
+
+def _percentile(counts, q):
+    return int(np.searchsorted(np.cumsum(counts), q * counts.sum()))
+
+
+def upgrade_times(stats, quantiles=(0.1, 0.5, 0.9)):
+    # Per pickaxe level: fraction that got there, and action-count percentiles among them.
+    rows = []
+    for level in range(1, LEVELS):
+        counts = stats["reached"][level][:-1]
+        got = counts.sum()
+        rows.append((cave.PICKAXE_UPGRADES[level]["name"], got / stats["agents"],
+                     [_percentile(counts, q) if got else None for q in quantiles]))
+    return rows
+
+
+def report(stats, policy):
+    agents = stats["agents"]
+    every = stats["every"]
+    names = [p["name"] for p in cave.PICKAXE_UPGRADES]
+    print(f"{'Action':>7} {'Mean $':>10} {'p10 $':>9} {'p50 $':>9} {'p90 $':>9}  " +
+          " ".join(f"{name:>7}" for name in names))
+    for i in range(len(stats["money"])):
+        hist = stats["money_hist"][i]
+        marks = [_percentile(hist, q) * MONEY_BIN for q in (0.1, 0.5, 0.9)]
+        tiers = stats["tiers"][i] / agents
+        print(f"{(i + 1) * every:>7} {stats['money'][i] / agents:>10,.0f} " +
+              " ".join(f"{m:>9,}" for m in marks) + "  " + " ".join(f"{t:>7.1%}" for t in tiers))
+    print(f"\nActions to each pickaxe ({policy} bots, {agents:,} players):")
+    for name, share, marks in upgrade_times(stats):
+        if marks[0] is None:
+            print(f"  {name:<8} reached by none")
+            continue
+        print(f"  {name:<8} reached by {share:>6.1%} | p10 {marks[0]:>5} | p50 {marks[1]:>5} | p90 {marks[2]:>5}")
+
+
+def benchmark(agents=100_000, actions=200, players=2_000, policy="greedy", seed=0):
+    start = time.perf_counter()
+    run_population(agents, actions, actions, policy, seed)
+    arrays = agents * actions / (time.perf_counter() - start)
+    start = time.perf_counter()
+    run_players(players, actions, actions, policy, seed)
+    objects = players * actions / (time.perf_counter() - start)
+    per_agent = Population(1000).nbytes() / 1000
+    print(f"Player objects: {objects:>14,.0f} agent-actions/sec")
+    print(f"Struct of arrays: {arrays:>12,.0f} agent-actions/sec ({arrays / objects:.0f}x)")
+    print(f"State per agent: {per_agent:.0f} bytes ({per_agent * 1_000_000 / 2 ** 20:,.0f} MiB per million)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Population simulator for cave-mining balancing")
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--actions", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=100, help="actions between progression samples")
+    parser.add_argument("--policy", choices=POLICIES, default="greedy")
+    parser.add_argument("--engine", choices=tuple(ENGINES), default="arrays",
+                        help="vectorized struct-of-arrays, or real Player objects")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bench", action="store_true", help="measure agent-actions per second")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(policy=args.policy)
+        return
+    start = time.perf_counter()
+    stats = simulate(args.agents, args.actions, args.every, args.policy, args.engine, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    report(stats, args.policy)
+    print(f"\n{args.agents * args.actions:,} agent-actions in {elapsed:.1f}s "
+          f"({args.agents * args.actions / elapsed:,.0f}/sec)")
+
+
+if __name__ == "__main__":
+    main()
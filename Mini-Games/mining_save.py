@@ -0,0 +1,329 @@
+import argparse
+import importlib
+import os
+import random
+import struct
+import time
+import zlib
+from array import array
+from collections import deque
+
+# Snapshot: header, fixed player fields, ingots, then each container as a slot count
+# followed by an ore-type byte array and an amount array, and a CRC32 of all of it.
+MAGIC = b"CAVE"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+PLAYER = struct.Struct("<qBBBHH")
+COUNT = struct.Struct("<I")
+CRC = struct.Struct("<I")
+
+# Journal: header naming the snapshot it follows, then one record per menu action:
+# menu key, the seed the action's random draws used, and the answers to its prompts.
+JOURNAL_MAGIC = b"CAVJ"
+RECORD = struct.Struct("<BIB")
+ANSWER = struct.Struct("<H")
+
+SNAPSHOT_EVERY = 100
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+class SaveError(Exception):
+    pass
+
+
+def _save_items(game):
+    return list(game.SHOP_ITEMS) + ["Coal"]
+
+
+def _mask(names, held):
+    return sum(1 << i for i, name in enumerate(names) if name in held)
+
+
+def _unmask(names, mask):
+    return {name for i, name in enumerate(names) if mask >> i & 1}
+
+
+def _pack_slots(inventory, ore_index):
+    types = array("B")
+    amounts = array("H")
+    for typ, amount in inventory:
+        types.append(ore_index[typ])
+        amounts.append(amount)
+    return [COUNT.pack(len(types)), types.tobytes(), amounts.tobytes()]
+
+
+def pack_player(player, game, seq=0):
+    names = _save_items(game)
+    ore_index = {f"{ore} Ore": i for i, ore in enumerate(game.ORE_TYPES)}
+    parts = [HEADER.pack(MAGIC, VERSION, seq),
+             PLAYER.pack(player.money, player.pickaxe_level, player.backpack_level, player.chest_level,
+                         _mask(names, player.suits), _mask(names, player.items)),
+             array("I", (player.ingots[ore] for ore in game.ORE_TYPES)).tobytes()]
+    parts += _pack_slots(player.backpack, ore_index)
+    parts += _pack_slots(player.chest, ore_index)
+    data = b"".join(parts)
+    return data + CRC.pack(zlib.crc32(data))
+
+
+def _unpack_slots(data, offset, inventory, ore_names):
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    types = array("B")
+    types.frombytes(data[offset:offset + count])
+    offset += count
+    amounts = array("H")
+    amounts.frombytes(data[offset:offset + 2 * count])
+    offset += 2 * count
+    for typ, amount in zip(types, amounts):
+        inventory.append((ore_names[typ], amount))
+    return offset
+
+
+def unpack_player(data, player, game):
+    # Fill a fresh Player from a snapshot; returns the journal sequence it was taken at.
+    if len(data) < HEADER.size + CRC.size:
+        raise SaveError("save file is truncated")
+    if zlib.crc32(data[:-CRC.size]) != CRC.unpack_from(data, len(data) - CRC.size)[0]:
+        raise SaveError("save file is damaged")
+    magic, version, seq = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveError("not a cave-mining save file")
+    if version != VERSION:
+        raise SaveError(f"unsupported save version {version}")
+    names = _save_items(game)
+    offset = HEADER.size
+    (player.money, player.pickaxe_level, player.backpack_level, player.chest_level,
+     suits, items) = PLAYER.unpack_from(data, offset)
+    player.suits = _unmask(names, suits)
+    player.items = _unmask(names, items)
+    offset += PLAYER.size
+    ingots = array("I")
+    ingots.frombytes(data[offset:offset + 4 * len(game.ORE_TYPES)])
+    player.ingots = dict(zip(game.ORE_TYPES, ingots))
+    offset += 4 * len(game.ORE_TYPES)
+    ore_names = [f"{ore} Ore" for ore in game.ORE_TYPES]
+    offset = _unpack_slots(data, offset, player.backpack, ore_names)
+    _unpack_slots(data, offset, player.chest, ore_names)
+    return seq
+
+
+def read_journal(data):
+    # Returns (base sequence, [(key, seed, answers)]). A torn last record is ignored.
+    if len(data) < HEADER.size:
+        return None, []
+    magic, version, base = HEADER.unpack_from(data)
+    if magic != JOURNAL_MAGIC or version != VERSION:
+        raise SaveError("not a cave-mining journal")
+    records = []
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        key, seed, count = RECORD.unpack_from(data, offset)
+        pos = offset + RECORD.size
+        answers = []
+        for _ in range(count):
+            if pos + ANSWER.size > len(data):
+                return base, records
+            size, = ANSWER.unpack_from(data, pos)
+            pos += ANSWER.size
+            if pos + size > len(data):
+                return base, records
+            answers.append(data[pos:pos + size].decode("utf-8", "replace"))
+            pos += size
+        records.append((chr(key), seed, answers))
+        offset = pos
+    return base, records
+
+
+def _record(key, seed, answers):
+    parts = [RECORD.pack(ord(key), seed, len(answers))]
+    for answer in answers:
+        raw = answer.encode("utf-8")[:0xFFFF]
+        parts.append(ANSWER.pack(len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+class Session:
+    # Keeps a Player on disk. Every menu action is appended to the journal before the next
+    # prompt; every snapshot_every actions the whole player is written to a new snapshot
+    # and the journal starts over. Loading replays the journal tail onto the snapshot.
+    def __init__(self, path, game=None, snapshot_every=SNAPSHOT_EVERY, new=False):
+        self.game = game or importlib.import_module("cave-mining")
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.pending = 0
+        self.replayed = 0
+        self.journal = None
+        self.player = self.game.Player()
+        if not new:
+            self._recover()
+        # Start every session from a fresh snapshot and an empty journal.
+        self.snapshot()
+
+    def _recover(self):
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                self.seq = unpack_player(f.read(), self.player, self.game)
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            base, records = read_journal(f.read())
+        if base is None or base > self.seq:
+            # Nothing usable to replay, or it follows a snapshot that is gone.
+            return
+        player = self.player
+        ask, say = player.ask, player.say
+        answers = deque()
+        player.ask = lambda prompt: answers.popleft() if answers else ""
+        player.say = _quiet
+        try:
+            for key, seed, recorded in records[self.seq - base:]:
+                answers.extend(recorded)
+                random.seed(seed)
+                getattr(player, self.game.GAME_ACTIONS[key])()
+                answers.clear()
+                self.seq += 1
+                self.replayed += 1
+        finally:
+            player.ask, player.say = ask, say
+        random.seed()
+
+    def run(self, key):
+        # Play one menu action, recording the answers it was given and the seed it used.
+        player = self.player
+        ask = player.ask
+        answers = []
+
+        def recording(prompt):
+            answer = ask(prompt)
+            answers.append(answer)
+            return answer
+
+        seed = random.getrandbits(32)
+        random.seed(seed)
+        player.ask = recording
+        try:
+            getattr(player, self.game.GAME_ACTIONS[key])()
+        finally:
+            player.ask = ask
+        self.journal.write(_record(key, seed, answers))
+        self.journal.flush()
+        self.seq += 1
+        self.pending += 1
+        if self.pending >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        data = pack_player(self.player, self.game, self.seq)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # A crash before the journal is reset only leaves records the snapshot already has.
+        if self.journal:
+            self.journal.close()
+        with open(self.journal_path, "wb") as f:
+            f.write(HEADER.pack(JOURNAL_MAGIC, VERSION, self.seq))
+        self.journal = open(self.journal_path, "ab")
+        self.pending = 0
+
+    def close(self):
+        self.snapshot()
+        self.journal.close()
+
+
+def _random_answers(rng):
+    def ask(prompt):
+        if "kg" in prompt:
+            return str(rng.randint(1, 60))
+        return str(rng.randint(0, 17))
+    return ask
+
+
+def check(path, actions=2000, seed=0):
+    # Play random menu actions, "crash" without closing, reload, and compare snapshots.
+    game = importlib.import_module("cave-mining")
+    for suffix in ("", ".journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    rng = random.Random(seed)
+    session = Session(path, game, snapshot_every=137)
+    session.player.ask = _random_answers(rng)
+    session.player.say = _quiet
+    session.player.money = 500_000
+    session.snapshot()
+    keys = list(game.GAME_ACTIONS)
+    weights = [40 if game.GAME_ACTIONS[key] == "explore" else 5 for key in keys]
+    for _ in range(actions):
+        session.run(rng.choices(keys, weights)[0])
+    live = pack_player(session.player, game, session.seq)
+    session.journal.close()
+    restored = Session(path, game)
+    same = pack_player(restored.player, game, restored.seq) == live
+    restored.close()
+    print(f"Crash recovery after {actions} actions: replayed {restored.replayed} journal records -> "
+          f"{'identical' if same else 'MISMATCH'}")
+    return same
+
+
+def benchmark(path, slots=100_000, actions=5000):
+    game = importlib.import_module("cave-mining")
+    player = game.Player()
+    for i in range(slots):
+        player.chest.append((f"{game.ORE_TYPES[i * 4 // slots]} Ore", 5 + i % 41))
+    player.backpack.append(("Copper Ore", 7))
+
+    start = time.perf_counter()
+    data = pack_player(player, game)
+    pack = time.perf_counter() - start
+    start = time.perf_counter()
+    unpack_player(data, game.Player(), game)
+    unpack = time.perf_counter() - start
+    print(f"Snapshot of a {slots:,}-slot chest: {len(data):,} bytes | pack {pack * 1000:.1f} ms | "
+          f"restore {unpack * 1000:.1f} ms")
+
+    for suffix in ("", ".journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    session = Session(path, game, snapshot_every=actions + 1)
+    session.player.ask = lambda prompt: "1"
+    session.player.say = _quiet
+    start = time.perf_counter()
+    for _ in range(actions):
+        session.player.explore()
+    bare = (time.perf_counter() - start) / actions
+    start = time.perf_counter()
+    for _ in range(actions):
+        session.run("2")
+    journaled = (time.perf_counter() - start) / actions
+    start = time.perf_counter()
+    session.snapshot()
+    snap = time.perf_counter() - start
+    session.close()
+    print(f"Explore: {bare * 1e6:.1f} us bare | {journaled * 1e6:.1f} us journaled | "
+          f"snapshot with fsync {snap * 1000:.2f} ms every {SNAPSHOT_EVERY} actions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cave-mining save file check and benchmark")
+    parser.add_argument("--path", default="mining_save_bench.sav")
+    parser.add_argument("--slots", type=int, default=100_000)
+    args = parser.parse_args()
+    try:
+        check(args.path)
+        benchmark(args.path, args.slots)
+    finally:
+        for suffix in ("", ".journal", ".tmp"):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import time
+
+import numpy as np
+
+from QuotaGamble import (MULTIPLIERS, QUOTA_GROWTH, ROUNDS_PER_CYCLE, STARTING_MONEY, STARTING_QUOTA,
+                         WEIGHTS)
+
+PROBABILITIES = np.array(WEIGHTS, dtype=float) / sum(WEIGHTS)
+PAYOUTS = np.array(MULTIPLIERS, dtype=float)
+MIN_MONEY = 0.01
+BUCKETS_PER_E = 128  # grid resolution: buckets per factor of e in bankroll
+
+
+def quotas(cycles):
+    quota, result = STARTING_QUOTA, []
+    for _ in range(cycles):
+        result.append(quota)
+        quota = round(quota * QUOTA_GROWTH, 2)
+    return result
+
+
+class Grid:
+    # Bankroll buckets spaced evenly in log(money). A fixed-fraction bet multiplies money
+    # by the same factor in every bucket, i.e. shifts the distribution by a constant.
+    def __init__(self, max_money, size=4096, min_money=MIN_MONEY):
+        self.x = np.linspace(np.log(min_money), np.log(max_money), size)
+        self.dx = self.x[1] - self.x[0]
+        self.money = np.exp(self.x)
+        self.size = size
+
+    def bucket_of(self, money):
+        return int(np.clip(np.rint((np.log(money) - self.x[0]) / self.dx), 0, self.size - 1))
+
+    def at_least(self, money):
+        return self.money >= money * (1 - 1e-9)
+
+
+def grid_for(policy, cycles, buckets=None, max_money=None):
+    # Tall enough that no bankroll a fixed policy can reach is clamped to the top bucket.
+    # The optimal policy may go all in every round, and value iteration costs a pass per
+    # round over the whole grid, so that grid stops at 1000x the last quota.
+    last_quota = max(quotas(cycles))
+    if max_money is None:
+        kind, value = policy
+        rounds = cycles * ROUNDS_PER_CYCLE
+        if kind == "fraction":
+            top = np.log(STARTING_MONEY) + rounds * np.log(1 - value + value * PAYOUTS.max())
+            max_money = np.exp(min(top, 700.0))
+        elif kind == "amount":
+            max_money = STARTING_MONEY + rounds * value * (PAYOUTS.max() - 1)
+        else:
+            max_money = last_quota * 1000
+        max_money = max(max_money, last_quota * 2)
+    if buckets is None:
+        buckets = max(4096, int(np.log(max_money / MIN_MONEY) * BUCKETS_PER_E))
+    return Grid(max_money, buckets)
+
+
+def _fft_convolve(a, b):
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+    return np.maximum(out, 0.0)
+
+
+def _fraction_kernel(grid, fraction):
+    # Spread each multiplier's log-shift over the two nearest buckets.
+    shifts = np.log(1 - fraction + fraction * PAYOUTS) / grid.dx
+    low = np.floor(shifts).astype(int)
+    offset = low.min()
+    kernel = np.zeros(low.max() - offset + 2)
+    upper = shifts - low
+    np.add.at(kernel, low - offset, PROBABILITIES * (1 - upper))
+    np.add.at(kernel, low - offset + 1, PROBABILITIES * upper)
+    return kernel, offset
+
+
+def _clip_into(grid, full, offset):
+    # Bucket t of the full convolution lands on grid bucket t + offset; fold the tails.
+    dist = np.zeros(grid.size)
+    lo, hi = max(0, -offset), min(len(full), grid.size - offset)
+    dist[lo + offset:hi + offset] = full[lo:hi]
+    dist[-1] += full[hi:].sum()
+    return dist, full[:lo].sum()
+
+
+def fraction_step(grid, dist, fraction):
+    kernel, offset = _fraction_kernel(grid, fraction)
+    return _clip_into(grid, _fft_convolve(dist, kernel), offset)
+
+
+def bet_step(grid, dist, bets):
+    # General per-bucket step for bets that are not a fixed fraction of the bankroll.
+    money = grid.money[:, None] + bets[:, None] * (PAYOUTS[None, :] - 1)
+    mass = dist[:, None] * PROBABILITIES[None, :]
+    out = np.zeros(grid.size)
+    busted = mass[money < grid.money[0]].sum()
+    keep = money >= grid.money[0]
+    pos = (np.log(money[keep]) - grid.x[0]) / grid.dx
+    low = np.minimum(np.floor(pos).astype(int), grid.size - 1)
+    upper = np.where(low < grid.size - 1, pos - low, 0.0)
+    np.add.at(out, low, mass[keep] * (1 - upper))
+    np.add.at(out, np.minimum(low + 1, grid.size - 1), mass[keep] * upper)
+    return out, busted
+
+
+def step(grid, dist, policy, round_index):
+    kind, value = policy
+    if kind == "fraction":
+        return fraction_step(grid, dist, value)
+    if kind == "amount":
+        return bet_step(grid, dist, np.minimum(value, grid.money))
+    return bet_step(grid, dist, value[round_index] * grid.money)
+
+
+def survival(policy, cycles, grid, money=STARTING_MONEY):
+    dist = np.zeros(grid.size)
+    dist[grid.bucket_of(money)] = 1.0
+    alive = 1.0
+    records = []
+    for cycle, quota in enumerate(quotas(cycles)):
+        for r in range(ROUNDS_PER_CYCLE):
+            dist, _ = step(grid, dist, policy, cycle * ROUNDS_PER_CYCLE + r)
+        passed = grid.at_least(quota)
+        before = dist.sum()
+        dist = np.where(passed, dist, 0.0)
+        after = dist.sum()
+        # The top bucket also holds every bankroll that grew past the grid. Once half the
+        # survivors are there the median is the grid bound, not a result.
+        above = dist[-1] / after if after else 0.0
+        records.append({
+            "cycle": cycle + 1,
+            "quota": quota,
+            "survive_cycle": after / alive if alive else 0.0,
+            "survive_total": after,
+            "above_grid": above,
+            "median_at_check": None if above >= 0.5 else _quantile(grid, dist, 0.5) if after else 0.0,
+            "lost_this_cycle": before - after,
+        })
+        alive = after
+    return records
+
+
+def _quantile(grid, dist, q):
+    cumulative = np.cumsum(dist)
+    return grid.money[np.searchsorted(cumulative, q * cumulative[-1])]
+
+
+def optimize(cycles, grid, fractions=None):
+    # Backward value iteration: best bet fraction per (round, bucket) for surviving every cycle.
+    if fractions is None:
+        fractions = np.linspace(0.02, 1.0, 50)
+    rounds = cycles * ROUNDS_PER_CYCLE
+    checks = quotas(cycles)
+    value = grid.at_least(checks[-1]).astype(float)
+    best = np.zeros((rounds, grid.size))
+    for r in range(rounds - 1, -1, -1):
+        candidates = np.empty((len(fractions), grid.size))
+        for k, fraction in enumerate(fractions):
+            shifted = grid.x[:, None] + np.log(1 - fraction + fraction * PAYOUTS)[None, :]
+            candidates[k] = np.interp(shifted, grid.x, value, left=0.0, right=value[-1]) @ PROBABILITIES
+        choice = candidates.argmax(axis=0)
+        best[r] = fractions[choice]
+        value = candidates[choice, np.arange(grid.size)]
+        if r and r % ROUNDS_PER_CYCLE == 0:
+            value = np.where(grid.at_least(checks[r // ROUNDS_PER_CYCLE - 1]), value, 0.0)
+    return value, best
+
+
+def parse_policy(text):
+    kind, _, value = text.partition(":")
+    if kind in ("fraction", "amount") and value:
+        return kind, float(value)
+    if kind == "optimal":
+        return kind, None
+    raise argparse.ArgumentTypeError(f"unknown policy {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact survival odds for QuotaGamble")
+    parser.add_argument("--policy", type=parse_policy, default=("fraction", 0.2),
+                        help="fraction:<f>, amount:<dollars> or optimal")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--buckets", type=int, default=None,
+                        help=f"grid size (default: {BUCKETS_PER_E} per factor of e, at least 4096)")
+    parser.add_argument("--max-money", type=float, default=None,
+                        help="top of the bankroll grid (default: the most the policy can reach)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    grid = grid_for(args.policy, args.cycles, args.buckets, args.max_money)
+    policy = args.policy
+    if policy[0] == "optimal":
+        value, best = optimize(args.cycles, grid)
+        print(f"Optimal policy: P(survive {args.cycles} cycles) = {value[grid.bucket_of(STARTING_MONEY)]:.6f}")
+        policy = ("table", best)
+        for cycle, quota in enumerate(quotas(args.cycles)[:5]):
+            row = best[cycle * ROUNDS_PER_CYCLE]
+            marks = ", ".join(f"${m:g}: {row[grid.bucket_of(m)]:.2f}" for m in (quota / 2, quota, quota * 2))
+            print(f"  cycle {cycle + 1} round 1 best fraction at {marks}")
+    records = survival(policy, args.cycles, grid)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'Cycle':>5} {'Quota':>12} {'P(survive cycle)':>17} {'P(alive)':>10} {'Above grid':>11} "
+          f"{'Median bankroll':>16}")
+    for rec in records:
+        median = rec["median_at_check"]
+        median = f"{median:>16.2f}" if median is not None else f"{'> grid':>16}"
+        print(f"{rec['cycle']:>5} {rec['quota']:>12.2f} {rec['survive_cycle']:>17.6f} "
+              f"{rec['survive_total']:>10.6f} {rec['above_grid']:>11.2%} {median}")
+    print(f"\n{args.cycles} cycles on {grid.size} buckets up to ${grid.money[-1]:.3g} in {elapsed:.2f}s")
+    if max(rec["above_grid"] for rec in records) >= 0.0001:
+        print("Bankrolls above the grid are held at its top bucket; raise --max-money to resolve them.")
+
+
+if __name__ == "__main__":
+    main()
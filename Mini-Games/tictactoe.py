@@ -1,59 +1,97 @@
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 
+from tictactoe_engine import solver
+from tictactoe_nk import MARKS, O, X, Board, Searcher
+
 class TicTacToe:
-    def __init__(self, root):
+    def __init__(self, root, size=3, k=None, ai=None, budget=1.0):
         self.root = root
-        self.root.title("Tic Tac Toe")
+        self.size = size
+        self.k = k or min(size, 5)
+        self.root.title("Tic Tac Toe" if (size, self.k) == (3, 3) else f"Tic Tac Toe {size}x{size}, {self.k} in a row")
         self.player = 'X'
-        self.buttons = [[None for _ in range(3)] for _ in range(3)]
+        # The board model is the game state; the buttons only display it.
+        self.board = Board(size, self.k)
+        self.ai = ai
+        self.budget = budget
+        self.solver = None
+        if ai:
+            # Classic 3x3 is solved outright; bigger boards are searched within the time budget.
+            self.solver = solver() if (size, self.k) == (3, 3) else Searcher(budget)
+        self.buttons = [[None for _ in range(size)] for _ in range(size)]
         self.create_buttons()
+        if self.ai == self.player:
+            self.ai_move()
 
     def create_buttons(self):
-        for i in range(3):
-            for j in range(3):
-                self.buttons[i][j] = tk.Button(self.root, text='', font=('normal', 40), width=5, height=2,
+        font = ('normal', 40 if self.size <= 3 else max(10, 120 // self.size))
+        width, height = (5, 2) if self.size <= 3 else (2, 1)
+        for i in range(self.size):
+            for j in range(self.size):
+                self.buttons[i][j] = tk.Button(self.root, text='', font=font, width=width, height=height,
                                                command=lambda i=i, j=j: self.click(i, j))
                 self.buttons[i][j].grid(row=i, column=j)
 
     def click(self, i, j):
-        if self.buttons[i][j]['text'] == '' and self.check_winner() is False:
-            self.buttons[i][j]['text'] = self.player
-            if self.check_winner():
-                messagebox.showinfo("Tic Tac Toe", f"Player {self.player} wins!")
-                self.reset_board()
-            elif self.check_draw():
-                messagebox.showinfo("Tic Tac Toe", "It's a draw!")
-                self.reset_board()
-            else:
-                self.player = 'O' if self.player == 'X' else 'X'
+        if self.player == self.ai:
+            return
+        if self.place(i, j) and self.player == self.ai:
+            self.ai_move()
+
+    def ai_move(self):
+        if isinstance(self.solver, Searcher):
+            i, j = divmod(self.solver.best_move(self.board)[0], self.size)
+        else:
+            cells = self.board.cells
+            x = sum(1 << c for c in range(9) if cells[c] == X)
+            o = sum(1 << c for c in range(9) if cells[c] == O)
+            i, j = self.solver.best_move(x, o)
+        self.place(i, j)
+
+    def place(self, i, j):
+        cell = i * self.size + j
+        if self.board.cells[cell]:
+            return False
+        self.board.play(cell)
+        self.buttons[i][j]['text'] = MARKS[self.board.cells[cell]]
+        if self.check_winner():
+            messagebox.showinfo("Tic Tac Toe", f"Player {self.player} wins!")
+            self.reset_board()
+        elif self.check_draw():
+            messagebox.showinfo("Tic Tac Toe", "It's a draw!")
+            self.reset_board()
+        else:
+            self.player = 'O' if self.player == 'X' else 'X'
+        return True
 
     def check_winner(self):
-        for i in range(3):
-            if self.buttons[i][0]['text'] == self.buttons[i][1]['text'] == self.buttons[i][2]['text'] != '':
-                return True
-            if self.buttons[0][i]['text'] == self.buttons[1][i]['text'] == self.buttons[2][i]['text'] != '':
-                return True
-        if self.buttons[0][0]['text'] == self.buttons[1][1]['text'] == self.buttons[2][2]['text'] != '':
-            return True
-        if self.buttons[0][2]['text'] == self.buttons[1][1]['text'] == self.buttons[2][0]['text'] != '':
-            return True
-        return False
+        # Board.play only checks the lines through the move it just made.
+        return bool(self.board.winner)
 
     def check_draw(self):
-        for row in self.buttons:
-            for button in row:
-                if button['text'] == '':
-                    return False
-        return True
+        return self.board.is_full()
 
     def reset_board(self):
         for row in self.buttons:
             for button in row:
                 button['text'] = ''
+        self.board = Board(self.size, self.k)
+        if isinstance(self.solver, Searcher):
+            self.solver = Searcher(self.budget)
         self.player = 'X'
+        if self.ai == self.player:
+            self.ai_move()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tic Tac Toe")
+    parser.add_argument("--size", type=int, default=3, help="board is size x size")
+    parser.add_argument("--k", type=int, default=None, help="marks in a row to win (default: size, at most 5)")
+    parser.add_argument("--ai", choices=("X", "O"), default=None,
+                        help="let the computer play this side (X moves first)")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds the computer may think per move")
+    args = parser.parse_args()
     root = tk.Tk()
-    game = TicTacToe(root)
-    root.mainloop()
\ No newline at end of file
+    game = TicTacToe(root, args.size, args.k, args.ai, args.budget)
+    root.mainloop()
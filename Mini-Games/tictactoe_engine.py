@@ -0,0 +1,141 @@
+import time
+
+# Board model: one 9-bit bitboard per player, bit 3 * row + col.
+SIZE = 3
+FULL = (1 << SIZE * SIZE) - 1
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+# Tried in this order when several moves are equally good: centre, corners, edges.
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+def bit(row, col):
+    return 1 << (row * SIZE + col)
+
+
+def is_win(bits):
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def is_full(x, o):
+    return x | o == FULL
+
+
+def to_move(x, o):
+    # X moves first, so X is to move whenever both have placed the same number of marks.
+    return "X" if bin(x).count("1") == bin(o).count("1") else "O"
+
+
+def _symmetries():
+    # The 8 rotations and reflections of the board as cell permutations, expanded into
+    # 512-entry lookup tables so a whole bitboard is transformed in one index.
+    cells = [(r, c) for r in range(SIZE) for c in range(SIZE)]
+    n = SIZE - 1
+    maps = [
+        lambda r, c: (r, c), lambda r, c: (c, n - r), lambda r, c: (n - r, n - c), lambda r, c: (n - c, r),
+        lambda r, c: (r, n - c), lambda r, c: (n - r, c), lambda r, c: (c, r), lambda r, c: (n - c, n - r),
+    ]
+    tables = []
+    for transform in maps:
+        dest = [transform(r, c) for r, c in cells]
+        table = []
+        for bits in range(FULL + 1):
+            out = 0
+            for i, (r, c) in enumerate(dest):
+                if bits >> i & 1:
+                    out |= bit(r, c)
+            table.append(out)
+        tables.append(table)
+    return tables
+
+
+SYMMETRIES = _symmetries()
+
+
+def canonical(x, o):
+    return min(table[x] << 9 | table[o] for table in SYMMETRIES)
+
+
+class Solver:
+    # Negamax over the whole game tree, once. The table holds one value per position up to
+    # symmetry (765 of them): from the side to move, +(empty cells + 1) for a win, so quicker
+    # wins and slower losses score better, 0 for a draw.
+    def __init__(self):
+        self.table = {}
+        self.moves = {}
+        start = time.perf_counter()
+        self.value(0, 0)
+        self.solve_time = time.perf_counter() - start
+
+    def value(self, me, them):
+        key = canonical(me, them)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        empty = FULL & ~(me | them)
+        if is_win(them):
+            result = -(bin(empty).count("1") + 1)
+        elif not empty:
+            result = 0
+        else:
+            result = max(-self.value(them, me | 1 << cell) for cell in MOVE_ORDER if empty >> cell & 1)
+        self.table[key] = result
+        return result
+
+    def best_move(self, x, o):
+        # Returns (row, col), or None when the game is over. The first query of a position
+        # looks up each empty cell's child; the answer is then kept per exact position.
+        key = x << 9 | o
+        move = self.moves.get(key, False)
+        if move is not False:
+            return move
+        if is_win(x) or is_win(o) or is_full(x, o):
+            move = None
+        else:
+            me, them = (x, o) if to_move(x, o) == "X" else (o, x)
+            empty = FULL & ~(x | o)
+            cell = max((cell for cell in MOVE_ORDER if empty >> cell & 1),
+                       key=lambda cell: -self.table[canonical(them, me | 1 << cell)])
+            move = divmod(cell, SIZE)
+        self.moves[key] = move
+        return move
+
+
+_solver = None
+
+
+def solver():
+    global _solver
+    if _solver is None:
+        _solver = Solver()
+    return _solver
+
+
+def main():
+    ai = solver()
+    print(f"Solved {len(ai.table)} positions (up to symmetry) in {ai.solve_time * 1000:.1f} ms; "
+          f"value of the empty board: {ai.table[canonical(0, 0)]}")
+    n = 100_000
+    start = time.perf_counter()
+    for _ in range(n):
+        ai.best_move(bit(0, 0), bit(1, 1))
+    print(f"best_move: {(time.perf_counter() - start) / n * 1e6:.2f} us")
+    # Perfect play against itself must draw.
+    x = o = 0
+    while ai.best_move(x, o):
+        row, col = ai.best_move(x, o)
+        if to_move(x, o) == "X":
+            x |= bit(row, col)
+        else:
+            o |= bit(row, col)
+    print("Self-play:", "X wins" if is_win(x) else "O wins" if is_win(o) else "draw")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import argparse
+import random
+import time
+from array import array
+
+EMPTY, X, O = 0, 1, 2
+MARKS = {X: "X", O: "O"}
+WIN = 10_000_000
+# Scores beyond this are wins/losses in (WIN - score) plies, not evaluations.
+MATE = WIN // 2
+# Up to this size every empty cell is searched; above it only cells next to a mark are.
+SMALL_BOARD = 5
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class Board:
+    # N x N board, k in a row wins. Every length-k line segment ("window") keeps a count of
+    # each player's marks, so a move only touches the windows through its cell: that
+    # updates the evaluation, detects a win and updates the Zobrist hash incrementally.
+    __slots__ = ("size", "k", "cells", "cell_windows", "x_count", "o_count", "values", "score", "hash",
+                 "zobrist", "moves", "near", "winner")
+
+    def __init__(self, size=3, k=3):
+        if not 1 < k <= size:
+            raise ValueError("need 1 < k <= size")
+        self.size = size
+        self.k = k
+        self.cells = bytearray(size * size)
+        self.cell_windows = [[] for _ in range(size * size)]
+        windows = 0
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in DIRECTIONS:
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        for i in range(k):
+                            self.cell_windows[(r + dr * i) * size + c + dc * i].append(windows)
+                        windows += 1
+        self.x_count = bytearray(windows)
+        self.o_count = bytearray(windows)
+        # Worth of a window to X holding x_count and O holding o_count marks in it.
+        weights = [0] + [4 ** i for i in range(k - 1)] + [WIN]
+        self.values = [[weights[x] if not o else -weights[o] if not x else 0 for o in range(k + 1)]
+                       for x in range(k + 1)]
+        self.score = 0
+        rng = random.Random(size * 1000 + k)
+        self.zobrist = [(0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size * size)]
+        self.hash = 0
+        self.moves = []
+        # Number of marks in the 3x3 block around each cell; non-zero marks a candidate move.
+        self.near = array("H", bytes(2 * size * size))
+        self.winner = EMPTY
+
+    def to_move(self):
+        return X if len(self.moves) % 2 == 0 else O
+
+    def is_full(self):
+        return len(self.moves) == self.size * self.size
+
+    def play(self, cell):
+        player = X if len(self.moves) % 2 == 0 else O
+        self.cells[cell] = player
+        values, xs, os_ = self.values, self.x_count, self.o_count
+        delta = 0
+        for w in self.cell_windows[cell]:
+            x, o = xs[w], os_[w]
+            if player == X:
+                xs[w] = x + 1
+                delta += values[x + 1][o] - values[x][o]
+                if x + 1 == self.k:
+                    self.winner = X
+            else:
+                os_[w] = o + 1
+                delta += values[x][o + 1] - values[x][o]
+                if o + 1 == self.k:
+                    self.winner = O
+        self.score += delta
+        self.hash ^= self.zobrist[cell][player]
+        self._touch(cell, 1)
+        self.moves.append(cell)
+
+    def undo(self):
+        cell = self.moves.pop()
+        player = self.cells[cell]
+        self.cells[cell] = EMPTY
+        values, xs, os_ = self.values, self.x_count, self.o_count
+        delta = 0
+        for w in self.cell_windows[cell]:
+            x, o = xs[w], os_[w]
+            if player == X:
+                xs[w] = x - 1
+                delta += values[x - 1][o] - values[x][o]
+            else:
+                os_[w] = o - 1
+                delta += values[x][o - 1] - values[x][o]
+        self.score += delta
+        self.hash ^= self.zobrist[cell][player]
+        self._touch(cell, -1)
+        # Play stops at the first win, so only the move being undone can have won.
+        self.winner = EMPTY
+
+    def _touch(self, cell, step):
+        size = self.size
+        r, c = divmod(cell, size)
+        for rr in range(max(r - 1, 0), min(r + 2, size)):
+            for cc in range(max(c - 1, 0), min(c + 2, size)):
+                self.near[rr * size + cc] += step
+
+    def candidates(self):
+        cells = self.cells
+        if not self.moves:
+            centre = self.size // 2
+            return [centre * self.size + centre]
+        if self.size <= SMALL_BOARD:
+            return [cell for cell in range(len(cells)) if not cells[cell]]
+        return [cell for cell, n in enumerate(self.near) if n and not cells[cell]]
+
+    def urgency(self, cell, player):
+        # How much a move here builds the mover's lines (counted double, so a win sorts
+        # ahead of a block) plus how much it blocks the other player's.
+        values, xs, os_ = self.values, self.x_count, self.o_count
+        build = block = 0
+        for w in self.cell_windows[cell]:
+            x, o = xs[w], os_[w]
+            if not o:
+                build += values[x + 1][0]
+            if not x:
+                block -= values[0][o + 1]
+        return 2 * build + block if player == X else 2 * block + build
+
+
+class Timeout(Exception):
+    pass
+
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def _to_table(value, ply):
+    # Win scores count plies from the root; the table stores them from this node, so
+    # the same position reached at another depth still reads the right distance.
+    if value > MATE:
+        return value + ply
+    if value < -MATE:
+        return value - ply
+    return value
+
+
+def _from_table(value, ply):
+    if value > MATE:
+        return value - ply
+    if value < -MATE:
+        return value + ply
+    return value
+
+
+class Searcher:
+    # Iterative-deepening negamax with alpha-beta, a Zobrist-keyed transposition table
+    # and move ordering (table move first, then by urgency). Each call to best_move
+    # answers within its time budget using the deepest search that finished.
+    def __init__(self, budget=1.0, max_depth=64):
+        self.budget = budget
+        self.max_depth = max_depth
+        self.table = {}
+        self.nodes = 0
+        self.deadline = None
+
+    def best_move(self, board, budget=None, max_depth=None):
+        budget = self.budget if budget is None else budget
+        max_depth = max_depth or self.max_depth
+        start = time.perf_counter()
+        self.deadline = start + budget if budget else None
+        self.nodes = 0
+        best, value, depth = None, 0, 0
+        played = len(board.moves)
+        remaining = board.size * board.size - played
+        for d in range(1, min(max_depth, remaining) + 1):
+            try:
+                value, move = self._root(board, d)
+            except Timeout:
+                # The search stopped mid-line: take back the moves it had made.
+                while len(board.moves) > played:
+                    board.undo()
+                break
+            best, depth = move, d
+            # A forced result within the horizon can't be improved by searching deeper.
+            # One reported by a deeper table entry can: a quicker win may still be found.
+            if abs(value) > MATE and WIN - abs(value) <= d:
+                break
+        if best is None:
+            # Not even depth 1 finished: fall back to the most urgent move.
+            player = board.to_move()
+            best = max(board.candidates(), key=lambda cell: board.urgency(cell, player))
+        elapsed = time.perf_counter() - start
+        return best, {"value": value, "depth": depth, "nodes": self.nodes, "time": elapsed}
+
+    def _ordered(self, board, first):
+        player = board.to_move()
+        moves = board.candidates()
+        moves.sort(key=lambda cell: board.urgency(cell, player), reverse=True)
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _root(self, board, depth):
+        entry = self.table.get(board.hash)
+        alpha, beta = -WIN - 1, WIN + 1
+        best_move = None
+        for move in self._ordered(board, entry[3] if entry else None):
+            board.play(move)
+            value = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            board.undo()
+            if best_move is None or value > alpha:
+                alpha, best_move = value, move
+        self.table[board.hash] = (depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.deadline and not self.nodes & 255 and time.perf_counter() > self.deadline:
+            raise Timeout
+        if board.winner:
+            return -(WIN - ply)
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return board.score if board.to_move() == X else -board.score
+
+        key = board.hash
+        entry = self.table.get(key)
+        first = None
+        if entry:
+            entry_depth, value, flag, first = entry
+            value = _from_table(value, ply)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        original_alpha = alpha
+        best, best_move = -WIN - 1, None
+        for move in self._ordered(board, first):
+            board.play(move)
+            value = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.undo()
+            if value > best:
+                best, best_move = value, move
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.table[key] = (depth, _to_table(best, ply), flag, best_move)
+        return best
+
+
+def position(size, k, moves):
+    board = Board(size, k)
+    for r, c in moves:
+        board.play(r * size + c)
+    return board
+
+
+# Standard positions for the benchmark: (name, size, k, moves, depth).
+POSITIONS = (
+    ("3x3 empty, full solve", 3, 3, (), 9),
+    ("4x4 k=4 empty", 4, 4, (), 7),
+    ("15x15 k=5 opening", 15, 5, ((7, 7), (7, 8), (8, 8), (6, 6)), 4),
+    ("15x15 k=5 open three", 15, 5, ((7, 7), (6, 7), (7, 8), (6, 8), (7, 6), (8, 9), (5, 5)), 4),
+    ("15x15 k=5 middle game", 15, 5, ((7, 7), (7, 8), (8, 7), (6, 7), (8, 8), (9, 9), (6, 6), (8, 6),
+                                       (9, 8), (10, 9), (6, 9), (5, 10)), 3),
+)
+
+
+def benchmark(budget=1.0):
+    print(f"{'Position':<24} {'Depth':>5} {'Nodes':>9} {'Time':>8} {'Nodes/sec':>10}  Move")
+    for name, size, k, moves, depth in POSITIONS:
+        board = position(size, k, moves)
+        move, info = Searcher().best_move(board, budget=0, max_depth=depth)
+        print(f"{name:<24} {info['depth']:>5} {info['nodes']:>9,} {info['time']:>7.2f}s "
+              f"{info['nodes'] / info['time']:>10,.0f}  {divmod(move, size)} (value {info['value']})")
+    print(f"\nWith a {budget:g}s budget per move:")
+    for name, size, k, moves, _ in POSITIONS:
+        board = position(size, k, moves)
+        move, info = Searcher(budget).best_move(board)
+        print(f"{name:<24} depth {info['depth']:>2} in {info['time']:.2f}s -> {divmod(move, size)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="N x N, k-in-a-row search engine")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per move")
+    args = parser.parse_args()
+    benchmark(args.budget)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os, json, time, atexit, tempfile, threading, argparse
+
+DEBOUNCE_SECONDS = 0.5
+MAX_DELAY_SECONDS = 2.0
+
+def write_atomic(path, data):
+    # Write a temp file next to the target and rename it over, so a crash leaves
+    # either the old config or the new one, never a truncated file.
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+class ConfigStore:
+    # save() only swaps in the latest snapshot and wakes the writer thread, so it is
+    # cheap to call on every change. The writer waits until changes have stopped for
+    # `debounce` seconds (or `max_delay` since the first unsaved one) and writes once.
+    def __init__(self, path, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+        self.path = path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.writes = 0
+        self._pending = None
+        self._first = self._last = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        # Serializes writes. _cond is released during one, so save() never waits for the disk.
+        self._io = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save(self, data):
+        with self._cond:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first = now
+            self._pending = data
+            self._last = now
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                if self._pending is None:
+                    self._cond.wait()
+                    continue
+                due = min(self._last + self.debounce, self._first + self.max_delay)
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            self.flush()
+
+    def flush(self):
+        with self._io:
+            with self._cond:
+                data, self._pending = self._pending, None
+            if data is None:
+                return
+            try:
+                write_atomic(self.path, data)
+                self.writes += 1
+            except Exception as e:
+                print("Config save error:", e)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+def selftest():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "config.json")
+        write_atomic(path, {"play_volume": 100.0})
+        store = ConfigStore(path, debounce=0.2, max_delay=1.0)
+        # A slider drag: one change every 5 ms for 3 seconds.
+        events = 0
+        start = time.monotonic()
+        while time.monotonic() - start < 3.0:
+            store.save({"play_volume": 100.0 - events * 0.1})
+            events += 1
+            time.sleep(0.005)
+        last = 100.0 - (events - 1) * 0.1
+        time.sleep(0.4)
+        print(f"Slider drag: {events} changes -> {store.writes} writes")
+        assert store.writes <= 4, store.writes
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["play_volume"] == last
+        # Pending changes are written on close, even inside the debounce window.
+        store.save({"play_volume": 1.0})
+        store.close()
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["play_volume"] == 1.0
+        # A failed write leaves the old file whole and no temp files behind.
+        try:
+            write_atomic(path, {"bad": object()})
+        except TypeError:
+            pass
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["play_volume"] == 1.0
+        assert os.listdir(d) == ["config.json"], os.listdir(d)
+    print("Config store selftest passed")
+
+def main():
+    parser = argparse.ArgumentParser(description="Debounced, atomic config writer")
+    parser.add_argument("--selftest", action="store_true", help="count writes during a simulated slider drag")
+    args = parser.parse_args()
+    if args.selftest:
+        selftest()
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import math, time, argparse
+
+import numpy as np
+
+FPS = 30
+HOLD_SECONDS = 1.5
+CLIP_LEVEL = 0.999
+RMS_SCALE = 300
+BLOCK_SIZES = (64, 128, 256, 512, 1024, 2048)
+
+def to_db(x):
+    return 20 * math.log10(x) if x > 0 else float("-inf")
+
+class Meter:
+    # The audio callback only calls process(), which writes into a preallocated slot:
+    # [rms, peak since last poll, blocks that clipped]. The UI thread calls poll() at
+    # its own frame rate and turns the slot into a bar level with peak hold.
+    def __init__(self, hold=HOLD_SECONDS, clip_level=CLIP_LEVEL):
+        self.hold = hold
+        self.clip_level = clip_level
+        self.slot = np.zeros(3)
+        self.held = 0.0
+        self.held_at = 0.0
+        self.clipped_at = None
+        self._clips_seen = 0
+
+    def process(self, indata):
+        x = indata[:, 0]
+        if not len(x):
+            return
+        slot = self.slot
+        slot[0] = math.sqrt(float(np.dot(x, x)) / len(x))
+        peak = max(float(x.max()), -float(x.min()))
+        if peak > slot[1]:
+            slot[1] = peak
+        if peak >= self.clip_level:
+            slot[2] += 1
+
+    def poll(self, now=None):
+        # Returns (bar level 0-100, held peak in dBFS, clipping within the hold time).
+        now = time.monotonic() if now is None else now
+        rms, peak, clips = self.slot
+        self.slot[1] = 0.0
+        if peak >= self.held or now - self.held_at > self.hold:
+            self.held, self.held_at = peak, now
+        if clips > self._clips_seen:
+            self._clips_seen = clips
+            self.clipped_at = now
+        clipping = self.clipped_at is not None and now - self.clipped_at <= self.hold
+        return min(rms * RMS_SCALE, 100), to_db(self.held), clipping
+
+def generator_rms(indata):
+    # What Soundboard._mic_cb used to do on every block.
+    total = sum(sample[0] ** 2 for sample in indata)
+    return math.sqrt(total / len(indata)) if len(indata) > 0 else 0
+
+def check():
+    meter = Meter(hold=1.0)
+    block = np.full((256, 1), 0.5, dtype=np.float32)
+    meter.process(block)
+    level, held, clipping = meter.poll(now=0.0)
+    assert abs(level - min(0.5 * RMS_SCALE, 100)) < 1e-6 and abs(held - to_db(0.5)) < 1e-6 and not clipping
+    quiet = np.full((256, 1), 0.01, dtype=np.float32)
+    meter.process(quiet)
+    assert abs(meter.poll(now=0.5)[1] - to_db(0.5)) < 1e-6, "peak should still be held"
+    meter.process(quiet)
+    assert abs(meter.poll(now=1.6)[1] - to_db(0.01)) < 1e-4, "peak should have been released"
+    loud = np.zeros((256, 1), dtype=np.float32)
+    loud[100] = -1.0
+    meter.process(loud)
+    assert meter.poll(now=2.0)[2] and meter.poll(now=2.9)[2] and not meter.poll(now=3.1)[2]
+    rng = np.random.default_rng(0)
+    noise = rng.uniform(-0.3, 0.3, (512, 1)).astype(np.float32)
+    meter.process(noise)
+    assert abs(meter.slot[0] - generator_rms(noise)) < 1e-5
+    print("Meter check passed")
+
+def benchmark(repeats=2000):
+    rng = np.random.default_rng(0)
+    print(f"{'Block':>6} {'Generator':>11} {'NumPy':>9} {'Speed-up':>9} {'Budget':>9}")
+    meter = Meter()
+    for size in BLOCK_SIZES:
+        block = rng.uniform(-0.5, 0.5, (size, 1)).astype(np.float32)
+        times = []
+        for fn in (generator_rms, meter.process):
+            n = max(10, repeats * 64 // size) if fn is generator_rms else repeats
+            start = time.perf_counter()
+            for _ in range(n):
+                fn(block)
+            times.append((time.perf_counter() - start) / n)
+        print(f"{size:>6} {times[0] * 1e6:>9.1f}us {times[1] * 1e6:>7.2f}us {times[0] / times[1]:>8.0f}x "
+              f"{size / 48000 * 1e3:>7.2f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mic meter check and per-block benchmark")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+    check()
+    benchmark(args.repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import time, wave, threading, argparse
+from collections import deque
+
+import numpy as np
+
+from pcm_cache import convert, fit_channels, resample
+
+try:
+    import sounddevice as sd
+    SD_AVAILABLE = True
+except ImportError:
+    SD_AVAILABLE = False
+
+MAX_VOICES = 32
+MAX_BLOCK = 8192
+STATS_WINDOW = 1024
+
+class Mixer:
+    # Sums any number of playing sounds into one output stream. The UI thread only
+    # appends (data, gain) to a deque (atomic in CPython, no lock); the audio callback
+    # moves them into a fixed set of voice slots and mixes through a preallocated
+    # scratch buffer, so it never blocks and allocates no sample memory. Buffers are
+    # converted before they get here (PCMCache.get with the mixer's rate and channels)
+    # and finished ones go back to the UI thread through another deque, so the callback
+    # never drops the last reference to one and frees it on the audio thread.
+    def __init__(self, rate=48000, channels=2, voices=MAX_VOICES, max_block=MAX_BLOCK):
+        self.rate = int(rate)
+        self.channels = channels
+        self._data = [None] * voices
+        self._pos = [0] * voices
+        self._gain = [0.0] * voices
+        self._incoming = deque()
+        self._finished = deque()
+        self._scratch = np.zeros((max_block, channels), dtype=np.float32)
+        self.cpu = np.zeros(STATS_WINDOW)
+        self.blocks = self.underruns = self.overruns = self.dropped = 0
+
+    def prepare(self, data, fs):
+        # For sounds that don't come from a PCMCache: convert once, then play() it.
+        return convert(data, fs, self.rate, self.channels)
+
+    def play(self, data, gain=1.0):
+        # data must already be float32 [frames, self.channels] at self.rate.
+        self.collect()
+        self._incoming.append((data, float(gain)))
+
+    def stop_all(self):
+        self._incoming.append(None)
+
+    def collect(self):
+        # Release buffers the callback has finished with, here on the UI thread.
+        self._finished.clear()
+
+    @property
+    def active(self):
+        return sum(d is not None for d in self._data)
+
+    def callback(self, outdata, frames, time_info, status):
+        start = time.perf_counter()
+        if status and status.output_underflow:
+            self.underruns += 1
+        outdata.fill(0)
+        data, pos, gain = self._data, self._pos, self._gain
+        while self._incoming:
+            item = self._incoming.popleft()
+            if item is None:
+                for v in range(len(data)):
+                    if data[v] is not None:
+                        self._finished.append(data[v])
+                        data[v] = None
+                continue
+            for v in range(len(data)):
+                if data[v] is None:
+                    data[v], pos[v], gain[v] = item[0], 0, item[1]
+                    break
+            else:
+                self._finished.append(item[0])
+                self.dropped += 1
+        scratch = self._scratch
+        step = len(scratch)
+        for v in range(len(data)):
+            d = data[v]
+            if d is None:
+                continue
+            p = pos[v]
+            n = min(frames, len(d) - p)
+            # The host picks the block size (blocksize=0) and may ask for more frames
+            # than the scratch buffer holds, so mix in chunks of at most max_block.
+            for i in range(0, n, step):
+                m = min(step, n - i)
+                np.multiply(d[p + i:p + i + m], gain[v], out=scratch[:m])
+                np.add(outdata[i:i + m], scratch[:m], out=outdata[i:i + m])
+            if p + n >= len(d):
+                self._finished.append(d)
+                data[v] = None
+            else:
+                pos[v] = p + n
+        np.clip(outdata, -1.0, 1.0, out=outdata)
+        elapsed = time.perf_counter() - start
+        self.cpu[self.blocks % STATS_WINDOW] = elapsed
+        self.blocks += 1
+        # Taking longer than the block lasts means the device is starved next time round.
+        if elapsed * self.rate > frames:
+            self.overruns += 1
+
+    def stats(self):
+        self.collect()
+        times = self.cpu[:min(self.blocks, STATS_WINDOW)]
+        return {"blocks": self.blocks, "active": self.active, "underruns": self.underruns,
+                "overruns": self.overruns, "dropped": self.dropped,
+                "callback_ms_mean": float(times.mean()) * 1000 if len(times) else 0.0,
+                "callback_ms_max": float(times.max()) * 1000 if len(times) else 0.0}
+
+class SoundDeviceOutput:
+    # One OutputStream that stays open for the life of the mixer.
+    def __init__(self, mixer, device=None, blocksize=0):
+        self.stream = sd.OutputStream(device=device, samplerate=mixer.rate, channels=mixer.channels,
+                                      dtype="float32", blocksize=blocksize, callback=mixer.callback)
+        self.stream.start()
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+def open_device(device=None, voices=MAX_VOICES):
+    info = sd.query_devices(device, "output")
+    mixer = Mixer(info["default_samplerate"], min(2, info["max_output_channels"]), voices)
+    return mixer, SoundDeviceOutput(mixer, device)
+
+class NullOutput:
+    # Pulls blocks from the mixer without audio hardware, optionally into a WAV file.
+    # render() runs as fast as possible; start() paces blocks in real time on a thread.
+    def __init__(self, mixer, path=None, blocksize=512):
+        self.mixer = mixer
+        self.blocksize = blocksize
+        self.block = np.zeros((blocksize, mixer.channels), dtype=np.float32)
+        self.wav = None
+        if path:
+            self.wav = wave.open(path, "wb")
+            self.wav.setnchannels(mixer.channels)
+            self.wav.setsampwidth(2)
+            self.wav.setframerate(mixer.rate)
+        self._running = False
+        self._thread = None
+
+    def render(self, frames):
+        out = []
+        for _ in range(-(-frames // self.blocksize)):
+            self.mixer.callback(self.block, self.blocksize, None, None)
+            if self.wav:
+                self.wav.writeframes((self.block * 32767).astype(np.int16).tobytes())
+            out.append(self.block.copy())
+        return np.concatenate(out)[:frames] if out else self.block[:0].copy()
+
+    def start(self):
+        def run():
+            period = self.blocksize / self.mixer.rate
+            due = time.perf_counter()
+            while self._running:
+                self.render(self.blocksize)
+                due += period
+                time.sleep(max(0.0, due - time.perf_counter()))
+        self._running = True
+        self._thread = threading.Thread(target=run, name="null-output", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+        if self.wav:
+            self.wav.close()
+
+def check():
+    # The mix must equal the naive sum of the voices, gains applied and clipped.
+    rate, rng = 48000, np.random.default_rng(1)
+    mixer = Mixer(rate, 2, voices=4)
+    out = NullOutput(mixer, blocksize=256)
+    sounds = [(rng.uniform(-0.2, 0.2, (n, 2)).astype(np.float32), g) for n, g in ((1000, 1.0), (3000, 0.5), (700, 2.0))]
+    expected = np.zeros((4000, 2), dtype=np.float32)
+    for data, g in sounds:
+        mixer.play(data, g)
+        expected[:len(data)] += data * g
+    mono = rng.uniform(-0.2, 0.2, 500).astype(np.float32)
+    mono2 = mixer.prepare(mono, rate)
+    mixer.play(mono2)
+    expected[:500] += mono[:, None]
+    mixer.play(mono2)
+    got = out.render(4000)
+    assert np.allclose(got, np.clip(expected, -1, 1), atol=1e-6), "mix differs from the naive sum"
+    assert mixer.dropped == 1 and mixer.active == 0, mixer.stats()
+    half = len(resample(fit_channels(mono, 2), 48000, 24000))
+    assert half == 250, half
+    # Finished buffers (four voices and the one dropped) are handed back, not freed
+    # by the callback.
+    assert len(mixer._finished) == 5, len(mixer._finished)
+    mixer.collect()
+    assert not mixer._finished
+    mixer.play(sounds[1][0])
+    out.render(256)
+    mixer.stop_all()
+    out.render(256)
+    assert mixer.active == 0
+    # Blocks longer than the scratch buffer are mixed in chunks.
+    small = Mixer(rate, 2, voices=4, max_block=300)
+    expected = np.zeros((4000, 2), dtype=np.float32)
+    for data, g in sounds:
+        small.play(data, g)
+        expected[:len(data)] += data * g
+    got = NullOutput(small, blocksize=1024).render(4000)
+    assert np.allclose(got, np.clip(expected, -1, 1), atol=1e-6), "chunked mix differs"
+    print("Mixer check passed:", mixer.stats())
+
+def benchmark(blocksize=512, seconds=5.0):
+    rate = 48000
+    print(f"Callback time per {blocksize}-frame block ({blocksize / rate * 1000:.1f} ms of audio):")
+    tone = np.repeat((np.sin(np.arange(rate * 2) * 2 * np.pi * 440 / rate) * 0.1).astype(np.float32)[:, None], 2, axis=1)
+    for voices in (1, 4, 16, 32):
+        mixer = Mixer(rate, 2, voices=voices)
+        out = NullOutput(mixer, blocksize=blocksize)
+        frames = 0
+        while frames < seconds * rate:
+            while mixer.active + len(mixer._incoming) < voices:
+                mixer.play(tone, 0.5)
+            out.render(blocksize)
+            frames += blocksize
+        s = mixer.stats()
+        load = s["callback_ms_mean"] / (blocksize / rate * 1000)
+        print(f"  {voices:>2} voices: mean {s['callback_ms_mean']:.3f} ms, max {s['callback_ms_max']:.3f} ms, "
+              f"{load:.1%} of real time, {s['overruns']} late blocks")
+
+def main():
+    parser = argparse.ArgumentParser(description="Soundboard mixer check and benchmark")
+    parser.add_argument("--blocksize", type=int, default=512)
+    parser.add_argument("--wav", default=None, help="also render a short overlapping mix to this WAV file")
+    args = parser.parse_args()
+    check()
+    benchmark(args.blocksize)
+    if args.wav:
+        mixer = Mixer(48000, 2)
+        out = NullOutput(mixer, args.wav)
+        t = np.arange(48000) / 48000
+        for i, f in enumerate((440, 550, 660)):
+            mixer.play(mixer.prepare(np.sin(2 * np.pi * f * t) * 0.2, 48000))
+            out.render(12000)
+        out.render(48000)
+        out.close()
+        print("Wrote", args.wav)
+
+if __name__ == "__main__":
+    main()
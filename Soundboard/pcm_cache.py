@@ -0,0 +1,211 @@
+import os, time, wave, threading, argparse, tempfile
+from collections import OrderedDict
+
+# Only decoding into sample arrays needs NumPy; the cache itself also holds pygame
+# Sounds, and that path has to work without it.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile as sf
+    SF_AVAILABLE = True
+except ImportError:
+    SF_AVAILABLE = False
+
+DEFAULT_BUDGET_MB = 256
+
+def decode(path):
+    # Whole file as float32 [frames, channels] plus its sample rate.
+    if SF_AVAILABLE:
+        return sf.read(path, dtype="float32", always_2d=True)
+    # Without soundfile only PCM .wav can be decoded, through the standard library.
+    with wave.open(path, "rb") as w:
+        width, channels, fs = w.getsampwidth(), w.getnchannels(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        data = ((b[:, 0] << 8 | b[:, 1] << 16 | b[:, 2] << 24) >> 8).astype(np.float32) / (1 << 23)
+    else:
+        dtype = {2: np.int16, 4: np.int32}[width]
+        data = np.frombuffer(raw, dtype=dtype).astype(np.float32) / (1 << (8 * width - 1))
+    return data.reshape(-1, channels), fs
+
+def resample(data, fs, rate):
+    # Linear interpolation, done once per (sound, device) when it is cached.
+    if fs == rate or not len(data):
+        return data
+    n = max(1, int(round(len(data) * rate / fs)))
+    src = np.arange(n) * (fs / rate)
+    idx = np.arange(len(data))
+    return np.stack([np.interp(src, idx, data[:, c]) for c in range(data.shape[1])], axis=1).astype(np.float32)
+
+def fit_channels(data, channels):
+    data = np.asarray(data, dtype=np.float32)
+    if data.ndim == 1:
+        data = data[:, None]
+    if data.shape[1] == channels:
+        return data
+    if data.shape[1] == 1:
+        return np.repeat(data, channels, axis=1)
+    if channels == 1:
+        return data.mean(axis=1, keepdims=True)
+    return data[:, :channels] if data.shape[1] > channels else np.pad(data, ((0, 0), (0, channels - data.shape[1])))
+
+def convert(data, fs, rate, channels):
+    return resample(fit_channels(data, channels), fs, rate)
+
+class PCMCache:
+    # LRU of decoded sounds keyed by (path, mtime, size), so an edited file is decoded
+    # again. get(path, rate, channels) caches the sound already converted for an output
+    # device instead, so playing it needs no work at all. Least recently played sounds
+    # are evicted once the total exceeds the budget; a sound bigger than the whole
+    # budget is decoded but never kept.
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB, decode=decode, nbytes=lambda item: item[0].nbytes):
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.decode = decode
+        self.nbytes = nbytes
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+        self.used = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, path, rate=None, channels=None):
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size, rate, channels)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item
+            self.misses += 1
+        item = self.decode(path)
+        if rate is not None:
+            item = convert(item[0], item[1], rate, channels), rate
+        self._store(key, item)
+        return item
+
+    def _store(self, key, item):
+        size = self.nbytes(item)
+        with self._lock:
+            # Versions of the file from before it changed on disk can't be played again.
+            for old in [k for k in self._keys.get(key[0], ()) if k[1:3] != key[1:3]]:
+                self._drop(old)
+            if size > self.budget:
+                return
+            self._items[key] = item
+            self._sizes[key] = size
+            self._keys.setdefault(key[0], set()).add(key)
+            self.used += size
+            while self.used > self.budget:
+                self._drop(next(iter(self._items)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        if key in self._items:
+            del self._items[key]
+            self.used -= self._sizes.pop(key)
+            keys = self._keys[key[0]]
+            keys.discard(key)
+            if not keys:
+                del self._keys[key[0]]
+
+    def discard(self, path):
+        with self._lock:
+            for key in list(self._keys.get(path, ())):
+                self._drop(key)
+
+    def resize(self, budget_mb):
+        with self._lock:
+            self.budget = int(budget_mb * 1024 * 1024)
+            while self.used > self.budget:
+                self._drop(next(iter(self._items)))
+                self.evictions += 1
+
+    def __contains__(self, path):
+        return path in self._keys
+
+    def __len__(self):
+        return len(self._items)
+
+    def prewarm(self, paths, rate=None, channels=None):
+        # Decode in a daemon thread so startup isn't held up; returns the thread.
+        def run():
+            for path in paths:
+                try:
+                    self.get(path, rate, channels)
+                except Exception as e:
+                    print("Prewarm error:", path, e)
+        t = threading.Thread(target=run, name="pcm-prewarm", daemon=True)
+        t.start()
+        return t
+
+def _write_wav(path, seconds, fs=44100, channels=2):
+    t = np.arange(int(seconds * fs)) / fs
+    tone = (np.sin(2 * np.pi * 440 * t) * 0.5 * 32767).astype(np.int16)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(fs)
+        w.writeframes(np.repeat(tone[:, None], channels, axis=1).tobytes())
+
+def benchmark(paths=None, presses=20, budget_mb=DEFAULT_BUDGET_MB, rate=48000, channels=2):
+    # Trigger-to-audio latency of the routed path: from the press until the mixer has
+    # rendered the first block with the sound in it. Test tones are 44.1 kHz and the
+    # mixer runs at 48 kHz, so an uncached press also pays for resampling.
+    from mixer import Mixer, NullOutput
+    tmp = None
+    if not paths:
+        tmp = tempfile.TemporaryDirectory()
+        paths = []
+        for seconds in (0.5, 2, 10, 30):
+            paths.append(os.path.join(tmp.name, f"tone_{seconds}s.wav"))
+            _write_wav(paths[-1], seconds)
+    print(f"Decoder: {'soundfile' if SF_AVAILABLE else 'wave (standard library)'}, mixer at {rate} Hz")
+    print(f"{'Sound':<28} {'Size':>8} {'No cache':>10} {'Decoded':>10} {'Converted':>10}")
+    cache = PCMCache(budget_mb)
+    mixer = Mixer(rate, channels)
+    out = NullOutput(mixer)
+    presses_by_mode = (
+        # Decode and convert on every press.
+        lambda path: mixer.prepare(*decode(path)),
+        # Cache the decode only, convert on every press.
+        lambda path: mixer.prepare(*cache.get(path)),
+        # Cache the sound converted for this mixer, what Soundboard.play does.
+        lambda path: cache.get(path, rate, channels)[0],
+    )
+    for path in paths:
+        rows = []
+        for press in presses_by_mode:
+            times = []
+            for _ in range(presses):
+                start = time.perf_counter()
+                mixer.play(press(path), 0.8)
+                out.render(out.blocksize)
+                times.append(time.perf_counter() - start)
+                mixer.stop_all()
+                out.render(out.blocksize)
+            rows.append(sorted(times)[len(times) // 2])
+        size = os.path.getsize(path)
+        print(f"{os.path.basename(path)[:28]:<28} {size / 1024:>6.0f}KB " + " ".join(f"{t * 1000:>8.3f}ms" for t in rows))
+    print(f"Cache: {len(cache)} sounds, {cache.used / 1024 / 1024:.1f} of {cache.budget / 1024 / 1024:.0f} MB, "
+          f"{cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions")
+    if tmp:
+        tmp.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description="Decoded PCM cache latency benchmark")
+    parser.add_argument("paths", nargs="*", help="sound files (default: generated test tones)")
+    parser.add_argument("--presses", type=int, default=20)
+    parser.add_argument("--budget-mb", type=float, default=DEFAULT_BUDGET_MB)
+    args = parser.parse_args()
+    benchmark(args.paths, args.presses, args.budget_mb)
+
+if __name__ == "__main__":
+    main()
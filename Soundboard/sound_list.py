@@ -0,0 +1,175 @@
+import time, argparse
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 32
+
+def visible_range(top, height, row_height, count):
+    # Indices [first, last) of the rows that show in a viewport starting at pixel `top`.
+    first = max(0, int(top // row_height))
+    last = min(count, int((top + height) // row_height) + 1)
+    return first, max(first, last)
+
+class _Row:
+    __slots__ = ("frame", "label", "window", "shown")
+
+    def __init__(self, frame, label, window):
+        self.frame, self.label, self.window = frame, label, window
+        self.shown = None
+
+class VirtualList(ttk.Frame):
+    # A scrolling list of `count` rows that only creates widgets for the rows on screen.
+    # Those rows are pooled: scrolling moves them and rebinds them to other indices, and
+    # insert/remove just shift the indices and refresh what is visible.
+    def __init__(self, master, count=0, text=lambda i: "", actions=(), row_height=ROW_HEIGHT):
+        super().__init__(master)
+        self.text = text
+        self.actions = actions
+        self.row_height = row_height
+        self.count = count
+        self.rows = []
+        self.indices = []
+        self.canvas = tk.Canvas(self, highlightthickness=0, yscrollincrement=row_height)
+        scroll = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=scroll.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", self._resize)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(seq, self._wheel)
+        self._update_region()
+
+    def _make_row(self):
+        frame = ttk.Frame(self.canvas)
+        label = ttk.Label(frame, width=30)
+        label.grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        slot = len(self.rows)
+        widgets = [frame, label]
+        for col, (name, callback) in enumerate(self.actions, start=1):
+            button = ttk.Button(frame, text=name, command=lambda slot=slot, cb=callback: cb(self.indices[slot]))
+            button.grid(row=0, column=col, padx=5, pady=2)
+            widgets.append(button)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            for w in widgets:
+                w.bind(seq, self._wheel)
+        window = self.canvas.create_window(0, 0, window=frame, anchor="nw")
+        self.rows.append(_Row(frame, label, window))
+        self.indices.append(None)
+
+    def _update_region(self):
+        self.canvas.configure(scrollregion=(0, 0, 1, self.count * self.row_height))
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _wheel(self, event):
+        step = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        self.canvas.yview_scroll(step * 3, "units")
+        self.refresh()
+
+    def _resize(self, event):
+        self.refresh()
+
+    def refresh(self, force_from=None):
+        # Rows at or after index `force_from` are redrawn even if they look unchanged.
+        first, last = visible_range(self.canvas.canvasy(0), self.canvas.winfo_height(), self.row_height, self.count)
+        while len(self.rows) < last - first:
+            self._make_row()
+        for slot, row in enumerate(self.rows):
+            i = first + slot
+            if i < last:
+                text = self.text(i)
+                if (force_from is not None and i >= force_from) or row.shown != (i, text):
+                    self.indices[slot] = i
+                    row.label.configure(text=text)
+                    self.canvas.coords(row.window, 0, i * self.row_height)
+                    if row.shown is None:
+                        self.canvas.itemconfigure(row.window, state="normal")
+                    row.shown = (i, text)
+            elif row.shown is not None:
+                self.canvas.itemconfigure(row.window, state="hidden")
+                self.indices[slot] = None
+                row.shown = None
+
+    def set_count(self, count):
+        self.count = count
+        self._update_region()
+        self.refresh(force_from=0)
+
+    def insert(self, index):
+        # Visible rows from `index` on move down one; rows above it and rows off
+        # screen cost nothing.
+        self._shift(index, 1)
+
+    def remove(self, index):
+        self._shift(index, -1)
+
+    def _shift(self, index, step):
+        self.count += step
+        self._update_region()
+        self.refresh(force_from=index)
+
+    def see(self, index):
+        self.canvas.yview_moveto(index / max(self.count, 1))
+        self.refresh()
+
+def _full_rebuild(inner, names, actions):
+    # The old update_list(): destroy everything and create four widgets per sound.
+    for w in inner.winfo_children():
+        w.destroy()
+    for i, name in enumerate(names):
+        ttk.Label(inner, text=name, width=30).grid(row=i, column=0, padx=5, pady=2, sticky="w")
+        for col, (label, callback) in enumerate(actions, start=1):
+            ttk.Button(inner, text=label, command=lambda i=i: callback(i)).grid(row=i, column=col, padx=5, pady=2)
+
+def benchmark(sizes=(100, 500, 1000, 2000, 5000)):
+    root = tk.Tk()
+    root.geometry("750x600")
+    actions = (("Play", print), ("Assign", print), ("🗑 Delete", print))
+    print(f"{'Sounds':>7} {'Full rebuild':>13} {'Virtual set':>12} {'Insert':>9} {'Scroll':>9} {'Rows':>5}")
+    for n in sizes:
+        names = [f"Sound {i:05d}" for i in range(n)]
+        inner = ttk.Frame(root)
+        inner.pack(fill="both", expand=True)
+        start = time.perf_counter()
+        _full_rebuild(inner, names, actions)
+        root.update_idletasks()
+        rebuild = time.perf_counter() - start
+        inner.destroy()
+        root.update()
+
+        vlist = VirtualList(root, text=lambda i: names[i], actions=actions)
+        vlist.pack(fill="both", expand=True)
+        root.update()
+        start = time.perf_counter()
+        vlist.set_count(n)
+        root.update_idletasks()
+        virtual = time.perf_counter() - start
+        start = time.perf_counter()
+        names.insert(0, "New sound")
+        vlist.insert(0)
+        root.update_idletasks()
+        insert = time.perf_counter() - start
+        steps = 50
+        start = time.perf_counter()
+        for _ in range(steps):
+            vlist._yview("scroll", 5, "units")
+            root.update_idletasks()
+        scroll = (time.perf_counter() - start) / steps
+        print(f"{n:>7} {rebuild * 1000:>11.1f}ms {virtual * 1000:>10.2f}ms {insert * 1000:>7.2f}ms "
+              f"{scroll * 1000:>7.2f}ms {len(vlist.rows):>5}")
+        vlist.destroy()
+    root.destroy()
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtualized sound list benchmark (needs a display)")
+    parser.add_argument("--bench", action="store_true", help="compare full rebuilds with the virtual list")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark()
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
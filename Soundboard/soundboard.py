@@ -1,23 +1,36 @@
-import os, json, shutil, math
+import os, json, shutil
 import tkinter as tk
 from tkinter import ttk, filedialog, simpledialog, messagebox
 
+from pcm_cache import PCMCache, DEFAULT_BUDGET_MB, SF_AVAILABLE
+from config_store import ConfigStore
+from sound_list import VirtualList
+
 try:
     import pygame
     pygame.mixer.init()
+    def _sound_bytes(snd):
+        freq, fmt, channels = pygame.mixer.get_init()
+        return int(snd.get_length() * freq) * channels * (abs(fmt) // 8)
+    # Loaded pygame Sounds, so a replay skips decoding the file again.
+    _default_cache = PCMCache(decode=pygame.mixer.Sound, nbytes=_sound_bytes)
     def _default_play(path, vol=1.0):
-        snd = pygame.mixer.Sound(path)
+        snd = _default_cache.get(path)
         snd.set_volume(vol)
         snd.play()
 except ImportError:
     import winsound
+    _default_cache = None
     def _default_play(path, vol=1.0):
         winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
 
 try:
     import sounddevice as sd
-    import soundfile as sf
-    SD_AVAILABLE = True
+    # The mixer and meter work on NumPy arrays, which only the sounddevice path needs.
+    from mixer import open_device
+    from meter import Meter, FPS
+    # pcm_cache decodes the routed sounds; without soundfile it can only read .wav.
+    SD_AVAILABLE = SF_AVAILABLE
 except ImportError:
     SD_AVAILABLE = False
 
@@ -33,6 +46,7 @@ AUDIO_EXTS = {".wav", ".mp3", ".ogg", ".flac"}
 
 class Soundboard(tk.Tk):
     SHORTCUT_KEYS = list("1234567890")
+    MAX_SOUNDS = 5000
 
     def __init__(self):
         super().__init__()
@@ -42,15 +56,23 @@ class Soundboard(tk.Tk):
         self._scan_devices()
 
         self.sounds = []
+        self.by_filename = {}
         self.shortcuts = {}
         self.use_mic_var = tk.BooleanVar()
         self.route_dev_var = tk.StringVar()
         self.play_vol_var = tk.DoubleVar()
         self.vm_mode_var = tk.BooleanVar()
         self.mic_level_var = tk.DoubleVar(value=0.0)
+        self.mic_peak_var = tk.StringVar(value="")
+        self.cache_mb = DEFAULT_BUDGET_MB
 
         os.makedirs(SAVEDIR, exist_ok=True)
         self._load_config()
+        self.config_store = ConfigStore(CONFIG_PATH)
+        self.pcm = PCMCache(self.cache_mb)
+        self.mixer = self._output = self._mixer_dev = None
+        if _default_cache is not None:
+            _default_cache.resize(self.cache_mb)
 
         self._build_settings_frame()
         self._build_shortcut_frame()
@@ -63,13 +85,22 @@ class Soundboard(tk.Tk):
 
         if SD_AVAILABLE:
             try:
+                self.meter = Meter()
                 self._mic_stream = sd.InputStream(device=None, channels=1, callback=self._mic_cb)
                 self._mic_stream.start()
+                self._poll_meter()
             except Exception as e:
                 print("Mic stream error:", e)
 
+        self._prewarm(self.shortcuts.values())
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.focus_set()
 
+    def _on_close(self):
+        self._close_mixer()
+        self.config_store.close()
+        self.destroy()
+
     def _scan_devices(self):
         if SD_AVAILABLE:
             all_devs = sd.query_devices()
@@ -95,26 +126,29 @@ class Soundboard(tk.Tk):
                 "name": name_map.get(fn, os.path.splitext(fn)[0]),
                 "path": os.path.join(SAVEDIR, fn)
             })
+        self.by_filename = {s["filename"]: s for s in self.sounds}
 
         self.shortcuts = {k: v for k, v in cfg.get("shortcuts", {}).items()
-                          if k in self.SHORTCUT_KEYS and v in [s["filename"] for s in self.sounds]}
+                          if k in self.SHORTCUT_KEYS and v in self.by_filename}
 
         self.use_mic_var.set(cfg.get("use_mic", False))
         self.route_dev_var.set(cfg.get("route_device") if cfg.get("route_device") in self.device_options_output
                                else (self.device_options_output[0] if self.device_options_output else ""))
         self.play_vol_var.set(cfg.get("play_volume", 100.0))
         self.vm_mode_var.set(cfg.get("vm_mode", False))
+        self.cache_mb = cfg.get("cache_mb", DEFAULT_BUDGET_MB)
 
     def _save_config(self):
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump({
-                "sounds": [{"filename": s["filename"], "name": s["name"]} for s in self.sounds],
-                "shortcuts": self.shortcuts,
-                "use_mic": self.use_mic_var.get(),
-                "route_device": self.route_dev_var.get(),
-                "play_volume": self.play_vol_var.get(),
-                "vm_mode": self.vm_mode_var.get()
-            }, f, indent=2)
+        # Cheap enough to call on every slider motion: the store coalesces the writes.
+        self.config_store.save({
+            "sounds": [{"filename": s["filename"], "name": s["name"]} for s in self.sounds],
+            "shortcuts": dict(self.shortcuts),
+            "use_mic": self.use_mic_var.get(),
+            "route_device": self.route_dev_var.get(),
+            "play_volume": self.play_vol_var.get(),
+            "vm_mode": self.vm_mode_var.get(),
+            "cache_mb": self.cache_mb
+        })
 
     def _build_settings_frame(self):
         frm = ttk.LabelFrame(self, text="Settings & Test Meters")
@@ -135,6 +169,8 @@ class Soundboard(tk.Tk):
         ttk.Label(frm, text="Mic Level:").grid(row=2, column=0, sticky="w")
         ttk.Progressbar(frm, orient="horizontal", maximum=100,
                         variable=self.mic_level_var).grid(row=2, column=1, padx=5, sticky="ew")
+        self.mic_peak_label = ttk.Label(frm, textvariable=self.mic_peak_var, width=14)
+        self.mic_peak_label.grid(row=2, column=2, padx=5, sticky="w")
 
         def enable_vm_mode():
             if self.vm_mode_var.get():
@@ -183,24 +219,25 @@ class Soundboard(tk.Tk):
     def _build_list_frame(self):
         lf = ttk.LabelFrame(self, text="All Loaded Sounds")
         lf.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-        canvas = tk.Canvas(lf)
-        scroll = ttk.Scrollbar(lf, orient="vertical", command=canvas.yview)
-        self.inner = ttk.Frame(canvas)
-        self.inner.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=self.inner, anchor="nw")
-        canvas.configure(yscrollcommand=scroll.set)
-        canvas.pack(side="left", fill="both", expand=True)
-        scroll.pack(side="right", fill="y")
-        self.update_list()
+        # Only the rows on screen exist as widgets, so the list scales to thousands of sounds.
+        self.sound_list = VirtualList(lf, len(self.sounds), text=lambda i: self.sounds[i]["name"],
+                                      actions=(("Play", self.play), ("Assign", self.assign), ("🗑 Delete", self.delete)))
+        self.sound_list.pack(fill="both", expand=True)
 
     def _mic_cb(self, indata, frames, time, status):
-        total = sum(sample[0] ** 2 for sample in indata)
-        rms = math.sqrt(total / len(indata)) if len(indata) > 0 else 0
-        self.mic_level_var.set(min(rms * 300, 100))
+        # Audio thread: no Tk calls here, _poll_meter picks the levels up.
+        self.meter.process(indata)
+
+    def _poll_meter(self):
+        level, peak_db, clipping = self.meter.poll()
+        self.mic_level_var.set(level)
+        self.mic_peak_var.set("CLIP" if clipping else f"Peak {peak_db:.1f} dB" if peak_db > -90 else "")
+        self.mic_peak_label.config(foreground="red" if clipping else "")
+        self.after(1000 // FPS, self._poll_meter)
 
     def load_sound(self):
-        if len(self.sounds) >= 100:
-            return messagebox.showwarning("Limit reached", "Max 100 sounds.")
+        if len(self.sounds) >= self.MAX_SOUNDS:
+            return messagebox.showwarning("Limit reached", f"Max {self.MAX_SOUNDS} sounds.")
         path = filedialog.askopenfilename(filetypes=[("Audio", "*.wav *.mp3 *.ogg *.flac")])
         if not path:
             return
@@ -214,19 +251,12 @@ class Soundboard(tk.Tk):
             dest = os.path.join(SAVEDIR, fn)
             i += 1
         shutil.copy2(path, dest)
-        self.sounds.append({"filename": fn, "name": name, "path": dest})
+        s = {"filename": fn, "name": name, "path": dest}
+        self.sounds.append(s)
+        self.by_filename[fn] = s
         self._save_config()
-        self.update_list()
-        self._refresh_shortcuts()
-
-    def update_list(self):
-        for w in self.inner.winfo_children():
-            w.destroy()
-        for i, s in enumerate(self.sounds):
-            ttk.Label(self.inner, text=s["name"], width=30).grid(row=i, column=0, padx=5, pady=2, sticky="w")
-            ttk.Button(self.inner, text="Play", command=lambda i=i: self.play(i)).grid(row=i, column=1, padx=5, pady=2)
-            ttk.Button(self.inner, text="Assign", command=lambda i=i: self.assign(i)).grid(row=i, column=2, padx=5, pady=2)
-            ttk.Button(self.inner, text="🗑 Delete", command=lambda i=i: self.delete(i)).grid(row=i, column=3, padx=5, pady=2)
+        self.sound_list.insert(len(self.sounds) - 1)
+        self.sound_list.see(len(self.sounds) - 1)
 
     def delete(self, idx):
         s = self.sounds[idx]
@@ -237,10 +267,14 @@ class Soundboard(tk.Tk):
         except OSError as e:
             return messagebox.showerror("Err", e)
         fn = s["filename"]
+        self.pcm.discard(s["path"])
+        if _default_cache is not None:
+            _default_cache.discard(s["path"])
         self.sounds.pop(idx)
+        del self.by_filename[fn]
         self.shortcuts = {k: v for k, v in self.shortcuts.items() if v != fn}
         self._save_config()
-        self.update_list()
+        self.sound_list.remove(idx)
         self._refresh_shortcuts()
 
     def assign(self, idx):
@@ -250,23 +284,56 @@ class Soundboard(tk.Tk):
         self.shortcuts[key] = self.sounds[idx]["filename"]
         self._save_config()
         self._refresh_shortcuts()
+        self._prewarm([self.shortcuts[key]])
+
+    def _routed(self):
+        return self.use_mic_var.get() and SD_AVAILABLE and self.route_dev_var.get()
+
+    def _prewarm(self, filenames):
+        # Decode shortcut sounds in the background for whichever player will use them.
+        paths = [self.by_filename[fn]["path"] for fn in set(filenames) if fn in self.by_filename]
+        if not paths:
+            return
+        if self._routed():
+            try:
+                mixer = self._mixer_for(self.route_dev_var.get())
+            except Exception as e:
+                return print("Output stream error:", e)
+            self.pcm.prewarm(paths, mixer.rate, mixer.channels)
+        elif _default_cache is not None:
+            _default_cache.prewarm(paths)
 
     def _refresh_shortcuts(self):
         for k, btn in self.shortcut_buttons.items():
             fn = self.shortcuts.get(k)
-            nm = next((s["name"] for s in self.sounds if s["filename"] == fn), "---")
+            s = self.by_filename.get(fn)
+            nm = s["name"] if s else "---"
             btn.config(text=f"{k}: {nm}")
 
+    def _mixer_for(self, name):
+        # One output stream per routed device, reopened only when the device changes.
+        if self._mixer_dev != name:
+            self._close_mixer()
+            self.mixer, self._output = open_device(self.device_map_output.get(name))
+            self._mixer_dev = name
+        return self.mixer
+
+    def _close_mixer(self):
+        if self._output:
+            self._output.close()
+        self.mixer = self._output = self._mixer_dev = None
+
     def play(self, idx):
-        s = self.sounds[idx]
+        self._play_sound(self.sounds[idx])
+
+    def _play_sound(self, s):
         vol = float(self.play_vol_var.get()) / 100.0
-        if self.use_mic_var.get() and SD_AVAILABLE and self.route_dev_var.get():
+        if self._routed():
             try:
-                data, fs = sf.read(s["path"], dtype="float32")
-                data *= vol
-                dev = self.device_map_output.get(self.route_dev_var.get())
-                sd.check_output_settings(device=dev, samplerate=fs)
-                sd.play(data, fs, device=dev)
+                mixer = self._mixer_for(self.route_dev_var.get())
+                # Cached already converted to the device's rate and channels.
+                data, _ = self.pcm.get(s["path"], mixer.rate, mixer.channels)
+                mixer.play(data, vol)
             except Exception as e:
                 messagebox.showerror("Playback Error", f"Could not play:\n{e}\nFallback to default.")
                 _default_play(s["path"], vol)
@@ -277,10 +344,9 @@ class Soundboard(tk.Tk):
                 _default_play(s["path"], 1.0)
 
     def _play_shortcut(self, key):
-        fn = self.shortcuts.get(key)
-        for i, s in enumerate(self.sounds):
-            if s["filename"] == fn:
-                return self.play(i)
+        s = self.by_filename.get(self.shortcuts.get(key))
+        if s:
+            self._play_sound(s)
 
 if __name__ == "__main__":
     app = Soundboard()